@@ -1,32 +1,207 @@
 # Models for All weather data
 
+import sys
+
+from .backendDecode import to_column
+from . import airQualityIndex
+from .timeAxis import TimeAxis
+
+
+class Measurement:
+    """One field of a CurrentWeather, readable like {"unit", "data"} dicts.
+
+    A view made on access, nothing is stored in it. The value is kept by
+    the record and the unit by the unit schema records share.
+    """
+
+    __slots__ = ("record", "field")
+
+    KEYS = ("data", "unit", "level_str")
+
+    def __init__(self, record, field) -> None:
+        self.record = record
+        self.field = field
+
+    def _read(self, key):
+        if key == "data":
+            return getattr(self.record, "_" + self.field, None)
+        if key == "unit":
+            return self.record.units.get(self.field)
+        if key == "level_str":
+            levels = self.record.levels
+            return None if levels is None else levels.get(self.field)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            value = self._read(key)
+        except KeyError:
+            return default
+        # Unset values and level strings read like missing dict keys
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        return self._read(key)
+
+    def __setitem__(self, key, value):
+        if key == "data":
+            self.record.set(self.field, value)
+        elif key == "unit":
+            self.record.set_unit(self.field, value)
+        elif key == "level_str":
+            self.record.set_level(self.field, value)
+        else:
+            raise KeyError(key)
+
+    def __repr__(self):
+        return f"Measurement({self['data']!r}, {self['unit']!r})"
+
+
+# Unit schemas, one shared {field: unit} dict per distinct set of units
+_unit_schemas = {}
+
+
+def _unit_schema(units):
+    units = {
+        field: sys.intern(unit) for field, unit in units.items() if isinstance(unit, str)
+    }
+    return _unit_schemas.setdefault(frozenset(units.items()), units)
+
 
 class CurrentWeather:
+    # Fields of the current api plus the ones filled from the hourly forecast
+    FIELDS = (
+        "time",
+        "interval",
+        "temperature_2m",
+        "relativehumidity_2m",
+        "apparent_temperature",
+        "is_day",
+        "uv_index",
+        "precipitation",
+        "weathercode",
+        "surface_pressure",
+        "windspeed_10m",
+        "winddirection_10m",
+        "dewpoint_2m",
+        "visibility",
+    )
+
+    # Values only, field units live in the shared schema of self.units and
+    # level strings, set for a few fields, in self.levels
+    __slots__ = ("units", "levels", *("_" + field for field in FIELDS))
+
     total_instances = 0
+    # Response fields this model does not know, reported once each
+    ignored_fields = set()
 
     def __init__(self, data) -> None:
-        # Dynamically create fields based on the data dictionary
-        for field, values in data.get("current").items():
-            setattr(
-                self,
-                field,
-                {"unit": data.get("current_units").get(field), "data": values},
-            )
+        self.units = _unit_schema(data.get("current_units") or {})
+        self.levels = None
+        for field, value in data.get("current").items():
+            if field in CurrentWeather.FIELDS:
+                setattr(self, "_" + field, value)
+            elif field not in CurrentWeather.ignored_fields:
+                CurrentWeather.ignored_fields.add(field)
+                print(f"CurrentWeather: ignoring unknown field '{field}'")
 
         CurrentWeather.total_instances += 1
 
+    def has(self, field):
+        return hasattr(self, "_" + field)
+
+    def set(self, field, data, unit=None, level_str=None):
+        if field not in CurrentWeather.FIELDS:
+            raise AttributeError(f"CurrentWeather has no field '{field}'")
+        setattr(self, "_" + field, data)
+        if unit is not None:
+            self.set_unit(field, unit)
+        if level_str is not None:
+            self.set_level(field, level_str)
+
+    def set_unit(self, field, unit):
+        # Switches to the schema with this unit, the shared one is not changed
+        if self.units.get(field) != unit:
+            self.units = _unit_schema({**self.units, field: unit})
+
+    def set_level(self, field, level_str):
+        if self.levels is None:
+            self.levels = {}
+        self.levels[field] = level_str
+
+    def fields(self):
+        return {
+            field: Measurement(self, field)
+            for field in CurrentWeather.FIELDS
+            if self.has(field)
+        }
+
     def print_data(self):
         from pprint import pprint
 
-        pprint(self.__dict__)
+        pprint(self.fields())
 
     def update_data(self, field, new_data):
-        if hasattr(self, field):
-            getattr(self, field)["data"] = new_data
+        if self.has(field):
+            self.set(field, new_data)
         else:
             print(f"Field '{field}' not found in WeatherData.")
 
 
+def _measurement_property(field):
+    return property(lambda self: Measurement(self, field))
+
+
+for _field in CurrentWeather.FIELDS:
+    setattr(CurrentWeather, _field, _measurement_property(_field))
+del _field
+
+
+def _concat(series, more):
+    # Typed arrays of the same kind are joined as arrays, anything else as list
+    if type(series) is type(more) and getattr(series, "typecode", None) == getattr(
+        more, "typecode", None
+    ):
+        return series + more
+    return list(series) + list(more)
+
+
+def _extend_series(model, other):
+    # Series of other after the last time step of model are appended. A
+    # series only one of them has is padded with None, so every column
+    # stays as long as time.
+    last_time = model.time["data"][-1]
+    other_time = other.time["data"]
+    start = 0
+    while start < len(other_time) and other_time[start] <= last_time:
+        start += 1
+    old_steps = len(model.time["data"])
+    new_steps = len(other_time) - start
+
+    merged = {}
+    for field, values in other.__dict__.items():
+        # Only the series are merged, the rest is derived again after extending
+        if not isinstance(values, dict):
+            continue
+        if hasattr(model, field):
+            head = getattr(model, field)["data"]
+        else:
+            head = [None] * old_steps
+        values["data"] = _concat(head, values["data"][start:])
+        merged[field] = values
+
+    for field, values in model.__dict__.items():
+        if isinstance(values, dict) and field not in merged:
+            values["data"] = _concat(values["data"], [None] * new_steps)
+            merged[field] = values
+
+    # time goes last as it sets how many steps readers iterate over
+    time_values = merged.pop("time")
+    for field, values in merged.items():
+        setattr(model, field, values)
+    model.time = time_values
+
+
 class HourlyWeather:
     total_instances = 0
 
@@ -38,11 +213,20 @@ class HourlyWeather:
             setattr(
                 self,
                 field,
-                {"unit": data.get("hourly_units").get(field), "data": values},
+                {"unit": data.get("hourly_units").get(field), "data": to_column(values)},
             )
 
+        # Offset of the location's local time, days are bounded by it
+        self.utc_offset_seconds = data.get("utc_offset_seconds", 0)
+        self.axis = TimeAxis(self.time["data"], self.utc_offset_seconds)
+
         HourlyWeather.total_instances += 1
 
+    def extend(self, other):
+        """Append the time steps of other that come after the last one of self."""
+        _extend_series(self, other)
+        self.axis = TimeAxis(self.time["data"], self.utc_offset_seconds)
+
     def print_data(self):
         from pprint import pprint
 
@@ -55,6 +239,115 @@ class HourlyWeather:
             print(f"Field '{field}' not found in WeatherData.")
 
 
+class SparseSeries:
+    """Fixed step time series storing only the runs of non zero values.
+
+    Precipitation is zero most of the time, so a 15 minute series is kept
+    as a list of (first index, values) runs and zeros cost nothing.
+    """
+
+    __slots__ = ("start", "step", "length", "runs")
+
+    def __init__(self, start, step, values):
+        self.start = start
+        self.step = step
+        self.length = len(values)
+        self.runs = []
+
+        run_start = None
+        for i, value in enumerate(values):
+            if value:
+                if run_start is None:
+                    run_start = i
+                    self.runs.append((i, []))
+                self.runs[-1][1].append(value)
+            else:
+                run_start = None
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, idx):
+        if idx < 0:
+            idx += self.length
+        if not 0 <= idx < self.length:
+            raise IndexError("SparseSeries index out of range")
+        for run_start, values in self.runs:
+            if run_start > idx:
+                break
+            if idx < run_start + len(values):
+                return values[idx - run_start]
+        return 0
+
+    def time(self, idx):
+        return self.start + idx * self.step
+
+    def index_at(self, ts):
+        return int((ts - self.start) // self.step)
+
+    def first_nonzero(self, from_idx=0):
+        for run_start, values in self.runs:
+            if run_start + len(values) > from_idx:
+                return max(run_start, from_idx)
+        return None
+
+    def total(self, from_idx=0, to_idx=None):
+        to_idx = self.length if to_idx is None else to_idx
+        total = 0
+        for run_start, values in self.runs:
+            first = max(run_start, from_idx)
+            last = min(run_start + len(values), to_idx)
+            if first < last:
+                total += sum(values[first - run_start : last - run_start])
+        return total
+
+    def merged(self, newer, keep_from):
+        """Series with the steps of newer replacing ours, older than keep_from dropped."""
+        start = min(self.start, newer.start)
+        start = max(start, keep_from - (keep_from - start) % self.step)
+        end = max(self.time(self.length), newer.time(newer.length))
+
+        values = []
+        ts = start
+        while ts < end:
+            if newer.start <= ts < newer.time(newer.length):
+                values.append(newer[newer.index_at(ts)])
+            elif self.start <= ts < self.time(self.length):
+                values.append(self[self.index_at(ts)])
+            else:
+                values.append(0)
+            ts += self.step
+        return SparseSeries(start, self.step, values)
+
+
+class NowcastWeather:
+    """15 minutely precipitation of the next hours."""
+
+    total_instances = 0
+
+    def __init__(self, data) -> None:
+        minutely = data.get("minutely_15")
+        times = minutely.get("time") or []
+        step = times[1] - times[0] if len(times) > 1 else 15 * 60
+        # An answer without steps gives an empty series
+        start = times[0] if len(times) else 0
+
+        self.precipitation = {
+            "unit": (data.get("minutely_15_units") or {}).get("precipitation"),
+            "data": SparseSeries(start, step, minutely.get("precipitation") or []),
+        }
+
+        NowcastWeather.total_instances += 1
+
+    def merge(self, newer, keep_from):
+        self.precipitation = {
+            "unit": newer.precipitation["unit"],
+            "data": self.precipitation["data"].merged(
+                newer.precipitation["data"], keep_from
+            ),
+        }
+
+
 class DailyWeather:
     total_instances = 0
 
@@ -64,11 +357,20 @@ class DailyWeather:
             setattr(
                 self,
                 field,
-                {"unit": data.get("daily_units").get(field), "data": values},
+                {"unit": data.get("daily_units").get(field), "data": to_column(values)},
             )
 
+        # Offset of the location's local time, days are bounded by it
+        self.utc_offset_seconds = data.get("utc_offset_seconds", 0)
+        self.axis = TimeAxis(self.time["data"], self.utc_offset_seconds)
+
         DailyWeather.total_instances += 1
 
+    def extend(self, other):
+        """Append the time steps of other that come after the last one of self."""
+        _extend_series(self, other)
+        self.axis = TimeAxis(self.time["data"], self.utc_offset_seconds)
+
     def print_data(self):
         from pprint import pprint
 
@@ -82,22 +384,88 @@ class DailyWeather:
 
 
 class Location:
+    """Result of a city search."""
+
+    __slots__ = ("name", "country", "state", "region", "latitude", "longitude")
+
     total_instances = 0
 
     def __init__(self, data) -> None:
-        # Dynamically create fields based on the data dictionary
-        for field, values in data.items():
-            setattr(self, field, values)
+        for field in Location.__slots__:
+            setattr(self, field, data.get(field))
 
-        DailyWeather.total_instances += 1
+        Location.total_instances += 1
 
     def print_data(self):
         from pprint import pprint
 
-        pprint(self.__dict__)
+        pprint({field: getattr(self, field) for field in Location.__slots__})
 
-    def update_data(self, field, new_data):
-        if hasattr(self, field):
-            getattr(self, field)["data"] = new_data
-        else:
-            print(f"Field '{field}' not found in WeatherData.")
+
+class AirQuality:
+    """Hourly pollutant series and the air quality indices computed from them."""
+
+    total_instances = 0
+
+    def __init__(self, data) -> None:
+        hourly = data.get("hourly")
+        for field, values in hourly.items():
+            setattr(
+                self,
+                field,
+                {"unit": data.get("hourly_units").get(field), "data": to_column(values)},
+            )
+
+        # Sub-indices of every pollutant, for the whole series at once
+        us_sub = {}
+        for pollutant in airQualityIndex.US_BREAKPOINTS:
+            if pollutant in hourly:
+                us_sub[pollutant] = airQualityIndex.us_sub_indices(
+                    pollutant, hourly[pollutant]
+                )
+        european_sub = {}
+        for pollutant in airQualityIndex.EUROPEAN_BREAKPOINTS:
+            if pollutant in hourly:
+                european_sub[pollutant] = airQualityIndex.european_sub_indices(
+                    pollutant, hourly[pollutant]
+                )
+
+        self.us_sub_indices = us_sub
+        self.european_sub_indices = european_sub
+        us_index, self.us_dominant = airQualityIndex.combine(us_sub)
+        european_index, self.european_dominant = airQualityIndex.combine(european_sub)
+
+        # Prefer the indices given by the api, the computed ones fill gaps
+        self.us_index = [
+            given if given is not None else computed
+            for given, computed in zip(hourly.get("us_aqi", us_index), us_index)
+        ]
+        self.european_index = [
+            given if given is not None else computed
+            for given, computed in zip(
+                hourly.get("european_aqi", european_index), european_index
+            )
+        ]
+        self.us_category = airQualityIndex.categories(
+            self.us_index, airQualityIndex.US_CATEGORY_BOUNDS
+        )
+        self.european_category = airQualityIndex.categories(
+            self.european_index, airQualityIndex.EUROPEAN_CATEGORY_BOUNDS
+        )
+
+        AirQuality.total_instances += 1
+
+    def __len__(self):
+        return len(self.time["data"])
+
+    def nearest_index(self, ts):
+        """Index of the hour closest to ts."""
+        times = self.time["data"]
+        return min(range(len(times)), key=lambda i: abs(times[i] - ts))
+
+    def snapshot(self, idx, fields):
+        return {
+            field: getattr(self, field)["data"][idx]
+            for field in fields
+            if hasattr(self, field)
+        }
@@ -0,0 +1,195 @@
+from array import array
+from bisect import bisect_left
+
+# Air quality indices computed from the hourly pollutant concentrations
+# (μg/m³) returned by Open-Meteo. Every function works on a whole series at
+# once, band lookup is a binary search over the table's upper bounds.
+
+# Molar volume at 25 °C and 1 atm, ppb = μg/m³ * MOLAR_VOLUME / molar mass
+MOLAR_VOLUME = 24.45
+MOLAR_MASS = {
+    "carbon_monoxide": 28.01,
+    "nitrogen_dioxide": 46.01,
+    "sulphur_dioxide": 64.07,
+    "ozone": 48.00,
+}
+
+# ============ US EPA ============
+# pollutant: (unit factor from μg/m³, decimals concentrations are truncated
+# to, [(concentration low, high, index low, high), ...])
+US_BREAKPOINTS = {
+    "pm2_5": (
+        1,
+        1,
+        [
+            (0.0, 9.0, 0, 50),
+            (9.1, 35.4, 51, 100),
+            (35.5, 55.4, 101, 150),
+            (55.5, 125.4, 151, 200),
+            (125.5, 225.4, 201, 300),
+            (225.5, 325.4, 301, 500),
+        ],
+    ),
+    "pm10": (
+        1,
+        0,
+        [
+            (0, 54, 0, 50),
+            (55, 154, 51, 100),
+            (155, 254, 101, 150),
+            (255, 354, 151, 200),
+            (355, 424, 201, 300),
+            (425, 604, 301, 500),
+        ],
+    ),
+    # ppb, 8 hour ozone bands
+    "ozone": (
+        MOLAR_VOLUME / MOLAR_MASS["ozone"],
+        0,
+        [
+            (0, 54, 0, 50),
+            (55, 70, 51, 100),
+            (71, 85, 101, 150),
+            (86, 105, 151, 200),
+            (106, 200, 201, 300),
+        ],
+    ),
+    # ppm
+    "carbon_monoxide": (
+        MOLAR_VOLUME / MOLAR_MASS["carbon_monoxide"] / 1000,
+        1,
+        [
+            (0.0, 4.4, 0, 50),
+            (4.5, 9.4, 51, 100),
+            (9.5, 12.4, 101, 150),
+            (12.5, 15.4, 151, 200),
+            (15.5, 30.4, 201, 300),
+            (30.5, 50.4, 301, 500),
+        ],
+    ),
+    # ppb
+    "nitrogen_dioxide": (
+        MOLAR_VOLUME / MOLAR_MASS["nitrogen_dioxide"],
+        0,
+        [
+            (0, 53, 0, 50),
+            (54, 100, 51, 100),
+            (101, 360, 101, 150),
+            (361, 649, 151, 200),
+            (650, 1249, 201, 300),
+            (1250, 2049, 301, 500),
+        ],
+    ),
+    # ppb
+    "sulphur_dioxide": (
+        MOLAR_VOLUME / MOLAR_MASS["sulphur_dioxide"],
+        0,
+        [
+            (0, 35, 0, 50),
+            (36, 75, 51, 100),
+            (76, 185, 101, 150),
+            (186, 304, 151, 200),
+            (305, 604, 201, 300),
+            (605, 1004, 301, 500),
+        ],
+    ),
+}
+
+# Upper index bound of each US category: Good, Moderate, Unhealthy for
+# sensitive groups, Unhealthy, Very unhealthy, Hazardous
+US_CATEGORY_BOUNDS = [50, 100, 150, 200, 300]
+
+# ============ European (EEA) ============
+# pollutant: upper concentration bound (μg/m³) of each index band of 20
+EUROPEAN_BREAKPOINTS = {
+    "pm2_5": [10, 20, 25, 50, 75, 800],
+    "pm10": [20, 40, 50, 100, 150, 1200],
+    "nitrogen_dioxide": [40, 90, 120, 230, 340, 1000],
+    "ozone": [50, 100, 130, 240, 380, 800],
+    "sulphur_dioxide": [100, 200, 350, 500, 750, 1250],
+}
+
+# Good, Fair, Moderate, Poor, Very poor, Extremely poor
+EUROPEAN_CATEGORY_BOUNDS = [20, 40, 60, 80, 100]
+
+POLLUTANT_NAMES = {
+    "pm2_5": "PM2.5",
+    "pm10": "PM10",
+    "ozone": "O₃",
+    "carbon_monoxide": "CO",
+    "nitrogen_dioxide": "NO₂",
+    "sulphur_dioxide": "SO₂",
+}
+
+
+def _truncate(value, decimals):
+    scale = 10**decimals
+    return int(value * scale) / scale
+
+
+def us_sub_indices(pollutant, concentrations):
+    """US AQI sub-index of every hour, None where the concentration is missing."""
+    factor, decimals, bands = US_BREAKPOINTS[pollutant]
+    highs = [band[1] for band in bands]
+    top = bands[-1][3]
+
+    indices = []
+    for value in concentrations:
+        if value is None:
+            indices.append(None)
+            continue
+        c = _truncate(value * factor, decimals)
+        band = bisect_left(highs, c)
+        if band == len(bands):
+            indices.append(top)
+            continue
+        c_lo, c_hi, i_lo, i_hi = bands[band]
+        indices.append(round((i_hi - i_lo) / (c_hi - c_lo) * (c - c_lo) + i_lo))
+    return indices
+
+
+def european_sub_indices(pollutant, concentrations):
+    """European AQI sub-index of every hour, linear within bands of 20."""
+    highs = EUROPEAN_BREAKPOINTS[pollutant]
+    top = len(highs) * 20
+
+    indices = []
+    for value in concentrations:
+        if value is None:
+            indices.append(None)
+            continue
+        band = bisect_left(highs, value)
+        if band == len(highs):
+            indices.append(top)
+            continue
+        c_lo = highs[band - 1] if band > 0 else 0
+        indices.append(round(band * 20 + 20 * (value - c_lo) / (highs[band] - c_lo)))
+    return indices
+
+
+def combine(sub_indices):
+    """Overall index and dominant pollutant of every hour.
+
+    sub_indices maps pollutant to its series, the index of an hour is the
+    highest sub-index of that hour.
+    """
+    pollutants = list(sub_indices)
+    columns = [sub_indices[p] for p in pollutants]
+
+    index = []
+    dominant = []
+    for hour in zip(*columns):
+        best = None
+        for i, value in enumerate(hour):
+            if value is not None and (best is None or value > hour[best]):
+                best = i
+        index.append(None if best is None else hour[best])
+        dominant.append(None if best is None else pollutants[best])
+    return index, dominant
+
+
+def categories(index, bounds):
+    """Category of every hour as position in bounds, -1 where unknown."""
+    return array(
+        "b", [-1 if value is None else bisect_left(bounds, value) for value in index]
+    )
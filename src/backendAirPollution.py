@@ -1,4 +1,5 @@
-import requests
+from .backendTransport import get_json
+from . import fieldRegistry
 
 
 base_url = "https://air-quality-api.open-meteo.com/v1/air-quality"
@@ -12,26 +13,11 @@ class AirPollution:
             hourly_fields = ",".join(kwargs.get("hourly"))
             url = url + f"&hourly={hourly_fields}"
 
-        try:
-            url = url + "&timeformat=unixtime" + "&forecast_days=1"
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception if the request was unsuccessful
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
+        # Two days so the next 24 hours are always covered
+        url = url + "&timeformat=unixtime" + "&forecast_days=2"
+        return get_json("air_pollution", url)
 
     def _get_current_air_pollution(self, lat, lon):
-        hourly_args = [
-            "european_aqi",
-            "us_aqi",
-            "pm10",
-            "pm2_5",
-            "carbon_monoxide",
-            "nitrogen_dioxide",
-            "sulphur_dioxide",
-            "ozone",
-            "ammonia",
-        ]
+        hourly_args = fieldRegistry.fields("air_pollution")
 
         return self.current_air_pollution(lat, lon, hourly=hourly_args)
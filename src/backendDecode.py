@@ -0,0 +1,57 @@
+from array import array
+
+# Fastest available json decoder, stdlib json is always there as fallback
+try:
+    import orjson
+
+    decoder = "orjson"
+except ImportError:
+    try:
+        import msgspec
+
+        decoder = "msgspec"
+        _msgspec_decoder = msgspec.json.Decoder()
+    except ImportError:
+        import json
+
+        decoder = "json"
+
+
+def loads(content):
+    """Decode a json response body (bytes) with the fastest decoder.
+
+    Malformed bodies raise ValueError whichever decoder is used.
+    """
+    if decoder == "orjson":
+        return orjson.loads(content)
+    if decoder == "msgspec":
+        try:
+            return _msgspec_decoder.decode(content)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(content)
+
+
+def to_column(values):
+    """Pack a homogeneous series of numbers into a typed array.
+
+    Integer series become array('q') and float series array('d'), which
+    take 8 bytes per value instead of a pointer plus a Python object.
+    Series mixing types or containing nulls are returned unchanged, so
+    indexing, slicing, max() and sum() behave the same for all of them.
+    """
+    if not isinstance(values, list) or len(values) == 0:
+        return values
+
+    first_type = type(values[0])
+    if first_type is int:
+        typecode = "q"
+    elif first_type is float:
+        typecode = "d"
+    else:
+        return values
+
+    for value in values:
+        if type(value) is not first_type:
+            return values
+    return array(typecode, values)
@@ -1,36 +1,60 @@
-import requests
+import threading
+
 from .Models import Location
+from .backendTransport import get_json, TransportError
+from .tracing import span
+
+# Results of earlier searches, keyed by the normalized query
+MAX_CACHED_SEARCHES = 128
+_search_cache = {}
+# Searches run in several worker threads at once
+_search_cache_lock = threading.Lock()
+
 
 def find_city(city, count=3):
+    """Locations matching city.
+
+    [] when nothing matches and None when the search failed.
+    """
+    key = (" ".join(city.lower().split()), count)
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+    if cached is not None:
+        return cached
+
     base_url = "https://geocoding-api.open-meteo.com/v1/search"
     params = {
-        "name": city,
+        "name": key[0],
         "language": 'en',
         "format": "json", 
         "count": count
     }
 
     try:
-        response = requests.get(base_url, params=params)
-        response.raise_for_status()  # Raise an exception if the request was unsuccessful
-        cities_res = response.json()
+        cities_res = get_json("geocoding", base_url, params=params, name="find_city")
         cities = cities_res.get('results')
         cities_list = []
         if cities is None:
             return cities_list
-        for city in cities:
-            data = {
-                "name": city.get('name'),
-                "country": city.get('country'),
-                "state": city.get('admin1'),
-                "region": city.get('admin2'),
-                "latitude": city.get('latitude'),
-                "longitude": city.get('longitude')
-            }
-
-            cities_list.append(Location(data))
+        with span("find_city.model", cat="model", count=len(cities)):
+            for city in cities:
+                data = {
+                    "name": city.get('name'),
+                    "country": city.get('country'),
+                    "state": city.get('admin1'),
+                    "region": city.get('admin2'),
+                    "latitude": city.get('latitude'),
+                    "longitude": city.get('longitude')
+                }
+
+                cities_list.append(Location(data))
+
+        with _search_cache_lock:
+            if len(_search_cache) >= MAX_CACHED_SEARCHES:
+                _search_cache.pop(next(iter(_search_cache)))
+            _search_cache[key] = cities_list
         return cities_list
 
-    except requests.exceptions.RequestException as e:
+    except TransportError as e:
         print(f"Error: {e}")
 
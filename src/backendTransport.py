@@ -0,0 +1,339 @@
+import time
+import random
+import threading
+from collections import OrderedDict
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .tracing import span
+from .backendDecode import loads, decoder
+
+# (connect, read) timeouts in seconds for every endpoint
+TIMEOUTS = {
+    "weather": (5, 15),
+    "minutely_15": (5, 15),
+    "air_pollution": (5, 15),
+    "geocoding": (3, 8),
+}
+DEFAULT_TIMEOUT = (5, 15)
+
+MAX_ATTEMPTS = 3
+BASE_DELAY = 0.5
+MAX_DELAY = 8
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Retries are shared by every endpoint, at most RETRY_BUDGET of them can be
+# spent and one is given back every RETRY_REFILL seconds
+RETRY_BUDGET = 10
+RETRY_REFILL = 30
+
+# Seconds a cached response is served without asking the server, after that
+# a conditional request is sent if the server gave an ETag or Last-Modified.
+# expire_cache() makes the next requests ask the server right away.
+CACHE_TTL = {
+    "weather": 10 * 60,
+    # Below the 5 minute nowcast refresh, so each refresh asks the server
+    "minutely_15": 4 * 60,
+    "air_pollution": 30 * 60,
+    "geocoding": 24 * 60 * 60,
+}
+# Responses kept, the least recently used ones are dropped first
+MAX_CACHE_ENTRIES = 128
+
+# Consecutive failures after which an endpoint is not called for a while
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 60
+
+session = requests.Session()
+# Every encoding urllib3 can decode here (gzip, deflate and br/zstd when
+# their modules are installed)
+session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+
+class TransportError(Exception):
+    """Request failed and there is no cached response to fall back to."""
+
+
+class _RetryableStatus(requests.exceptions.HTTPError):
+    pass
+
+
+class RetryBudget:
+    def __init__(self, capacity, refill_interval):
+        self.capacity = capacity
+        self.refill_interval = refill_interval
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self):
+        with self.lock:
+            now = time.monotonic()
+            refill = (now - self.updated_at) / self.refill_interval
+            if refill >= 1:
+                self.tokens = min(self.capacity, self.tokens + int(refill))
+                self.updated_at = now
+            if self.tokens == 0:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            # Half open: let a single trial request through after cooldown
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+retry_budget = RetryBudget(RETRY_BUDGET, RETRY_REFILL)
+breakers = {
+    endpoint: CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+    for endpoint in TIMEOUTS
+}
+
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, data, etag, last_modified):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+    def is_fresh(self, ttl):
+        return time.monotonic() - self.fetched_at < ttl
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+# Last good payload of every request, revalidated with conditional requests
+# and served as is when the api is unavailable
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None:
+            _cache.move_to_end(key)
+        return entry
+
+
+def _cache_put(key, entry):
+    with _cache_lock:
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def expire_cache():
+    """Revalidate every cached response on its next request.
+
+    Used when the user asks for a refresh. The bodies are kept, a 304
+    answer still reuses them and they remain the fallback when the api
+    is unavailable.
+    """
+    with _cache_lock:
+        for entry in _cache.values():
+            entry.fetched_at = float("-inf")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+# Requests currently in flight, keyed like the cache
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _cache_key(url, params):
+    if not params:
+        return (url, ())
+    return (url, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+
+def _retry_delay(attempt, response):
+    # Honour Retry-After of rate limited and unavailable responses
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(MAX_DELAY, int(retry_after))
+
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2**attempt))
+
+
+def get_json(endpoint, url, params=None, name=None):
+    """GET url and return the decoded json body.
+
+    A cached body younger than the endpoint's ttl is returned without a
+    request, unless expire_cache() was called since. Older ones are
+    revalidated with If-None-Match/If-Modified-Since and a 304 answer only
+    renews the ttl, the body is not parsed again.
+
+    Timeouts, connection errors, 5xx and 429 responses are retried with
+    exponential backoff while the global retry budget lasts. If the request
+    still fails, or the endpoint's circuit breaker is open, the last good
+    response for the same request is returned. TransportError is raised
+    when there is none.
+
+    Concurrent calls for the same request share a single network call.
+    """
+    name = name or endpoint
+    key = _cache_key(url, params)
+    entry = _cache_get(key)
+    if entry is not None and entry.is_fresh(CACHE_TTL.get(endpoint, 0)):
+        return entry.data
+
+    # Single flight: callers asking for the same request while it is in
+    # flight wait for its result instead of sending their own
+    with _inflight_lock:
+        call = _inflight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _inflight[key] = _Call()
+
+    if not is_leader:
+        with span(f"{name}.coalesced", cat="network"):
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _fetch(endpoint, url, params, name, key, entry)
+    except Exception as e:
+        # Waiters get the same error, not a missing result
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+    return call.result
+
+
+def _fetch(endpoint, url, params, name, key, entry):
+    headers = entry.validators() if entry is not None else None
+    breaker = breakers.setdefault(
+        endpoint, CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+    )
+
+    if not breaker.allow():
+        return _fallback(key, TransportError(f"{endpoint} circuit is open"))
+
+    error = None
+    # Only an unavailable server opens the circuit, a request the server
+    # rejects (400, 404) or a malformed body says nothing about its health
+    server_failed = False
+    for attempt in range(MAX_ATTEMPTS):
+        response = None
+        try:
+            with span(f"{name}.network", cat="network", url=url, attempt=attempt) as sp:
+                response = session.get(
+                    url,
+                    params=params,
+                    headers=headers,
+                    timeout=TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT),
+                )
+                sp.set(
+                    status=response.status_code,
+                    bytes=len(response.content),
+                    elapsed_ms=response.elapsed.total_seconds() * 1000,
+                )
+            if response.status_code in RETRYABLE_STATUS:
+                raise _RetryableStatus(
+                    f"{response.status_code} for url: {response.url}", response=response
+                )
+            if response.status_code == 304 and entry is not None:
+                breaker.success()
+                entry.fetched_at = time.monotonic()
+                return entry.data
+
+            response.raise_for_status()  # Raise an exception if the request was unsuccessful
+
+            with span(f"{name}.parse", cat="parse", decoder=decoder):
+                data = loads(response.content)
+
+            breaker.success()
+            _cache_put(
+                key,
+                CacheEntry(
+                    data,
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                ),
+            )
+            return data
+
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            _RetryableStatus,
+        ) as e:
+            error = e
+            server_failed = True
+            if attempt == MAX_ATTEMPTS - 1 or not retry_budget.take():
+                break
+            time.sleep(_retry_delay(attempt, response))
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # Other client errors and malformed bodies will not get better
+            error = e
+            server_failed = False
+            if response is not None:
+                # The server answered, it is reachable
+                breaker.success()
+            break
+
+    if server_failed:
+        breaker.failure()
+    return _fallback(key, error)
+
+
+def _fallback(key, error):
+    print(f"Error: {error}")
+    entry = _cache_get(key)
+    if entry is not None:
+        print("Using last good response")
+        return entry.data
+    raise TransportError(str(error)) from error
@@ -1,104 +1,149 @@
-import requests
-import datetime
-
 from .config import settings
+from .backendTransport import get_json
+from . import fieldRegistry
 
-extend_url = ""
 base_url = "https://api.open-meteo.com/v1/forecast"
 
+# Horizon limits of the forecast api
+MAX_FORECAST_DAYS = 16
+MAX_PAST_DAYS = 92
+
 
 class Weather:
     """
     See Documentation at: https://open-meteo.com/en/docs
     """
 
-    def __init__(self) -> None:
-        global extend_url
-
-        if settings.unit == "imperial":
-            extend_url = "&temperature_unit=fahrenheit&wind_speed_unit=mph"
+    def __init__(self, unit=None) -> None:
+        # unit overrides the one set in preferences, "metric" or "imperial".
+        # Kept per instance, fetches of both units can run at the same time.
+        if (unit or settings.unit) == "imperial":
+            self.extend_url = "&temperature_unit=fahrenheit&wind_speed_unit=mph"
         else:
-            extend_url = ""
+            self.extend_url = ""
 
     # Current Weather =============================================
-    @classmethod
-    def current_weather(cls,latitude: float, longitude: float, **kwargs):
+    def current_weather(self, latitude: float, longitude: float, **kwargs):
         url = base_url + f"?latitude={latitude}&longitude={longitude}"
 
         # Check for kwargs keyword parameters
         if "current" in kwargs:
             current_fields = ",".join(kwargs.get("current"))
-            url = url + f"&current={current_fields}" + extend_url
+            url = url + f"&current={current_fields}" + self.extend_url
 
-        try:
-            url = url + "&timeformat=unixtime"
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception if the request was unsuccessful
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
+        url = url + "&timeformat=unixtime"
+        return get_json("weather", url, name="weather.current")
 
     def _get_current_weather(self, lat, lon):
-        current_args = [
-            "temperature_2m",
-            "relativehumidity_2m",
-            "apparent_temperature",
-            "is_day",
-            "uv_index",
-            "precipitation",
-            "weathercode",
-            "surface_pressure",
-            "windspeed_10m",
-            "winddirection_10m",
-        ]
+        current_args = fieldRegistry.fields("current")
         return self.current_weather(lat, lon, current=current_args)
 
+    # Several locations in one request ================================
+    def current_weather_batch(self, coords, **kwargs):
+        """Current weather of many locations, one result per (lat, lon) of coords."""
+        latitudes = ",".join(str(lat) for lat, lon in coords)
+        longitudes = ",".join(str(lon) for lat, lon in coords)
+        url = base_url + f"?latitude={latitudes}&longitude={longitudes}"
+
+        if "current" in kwargs:
+            current_fields = ",".join(kwargs.get("current"))
+            url = url + f"&current={current_fields}" + self.extend_url
+        if "daily" in kwargs:
+            daily_fields = ",".join(kwargs.get("daily"))
+            url = url + f"&daily={daily_fields}"
+
+        url = url + "&timezone=auto&forecast_days=1&timeformat=unixtime"
+        data = get_json("weather", url, name="weather.batch")
+
+        # A single location is answered with an object instead of a list
+        if isinstance(data, dict):
+            return [data]
+        return data
+
+    def _get_overview(self, coords):
+        current_args = fieldRegistry.fields("current")
+        daily_args = fieldRegistry.fields("overview_daily")
+        return self.current_weather_batch(coords, current=current_args, daily=daily_args)
+
     # Hourly Forecast ==============================================
-    @classmethod
-    def forecast_hourly(cls,latitude: float, longitude: float, **kwargs):
+    def forecast_hourly(self, latitude: float, longitude: float, **kwargs):
         url = base_url + f"?latitude={latitude}&longitude={longitude}"
 
         # Check for kwargs keyword parameters
         if "hourly" in kwargs:
             hourly_fields = ",".join(kwargs.get("hourly"))
-            url = url + f"&hourly={hourly_fields}" + extend_url
-
-        try:
-            url = url + "&timeformat=unixtime"
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception if the request was unsuccessful
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-
-    def _get_hourly_forecast(self, lat, lon):
-        hourly_args = [
-            "temperature_2m",
-            "relativehumidity_2m",
-            "dewpoint_2m",
-            "apparent_temperature",
-            "weathercode",
-            "precipitation",
-            "precipitation_probability",
-            "surface_pressure",
-            "visibility",
-            "windspeed_10m",
-            "wind_direction_10m",
-            "uv_index",
-            "is_day",
-        ]
-
-        today = datetime.datetime.today().date()
-        tomorrow = today + datetime.timedelta(days=1)
+            url = url + f"&hourly={hourly_fields}" + self.extend_url
+
+        if "timezone" in kwargs:
+            url = url + f"&timezone={kwargs.get('timezone')}"
+
+        url = url + self._horizon_params(**kwargs)
+        url = url + "&timeformat=unixtime"
+        return get_json("weather", url, name="weather.hourly")
+
+    @staticmethod
+    def _horizon_params(**kwargs):
+        # Either a date range or a number of days around today
+        params = ""
+        if "start_date" in kwargs:
+            params += f"&start_date={kwargs.get('start_date')}"
+        if "end_date" in kwargs:
+            params += f"&end_date={kwargs.get('end_date')}"
+        if "forecast_days" in kwargs:
+            forecast_days = min(kwargs.get("forecast_days"), MAX_FORECAST_DAYS)
+            params += f"&forecast_days={forecast_days}"
+        if "past_days" in kwargs:
+            past_days = min(kwargs.get("past_days"), MAX_PAST_DAYS)
+            params += f"&past_days={past_days}"
+        return params
+
+    def _get_hourly_forecast(self, lat, lon, start_date=None, end_date=None):
+        hourly_args = fieldRegistry.fields("hourly")
+
+        # Dates and days are in the location's time zone, the response
+        # carries its utc_offset_seconds
+        if start_date is None:
+            # Today and tomorrow
+            return self.forecast_hourly(
+                lat, lon, hourly=hourly_args, timezone="auto", forecast_days=2
+            )
         return self.forecast_hourly(
-            lat, lon, hourly=hourly_args, start_date=today, end_date=tomorrow
+            lat,
+            lon,
+            hourly=hourly_args,
+            timezone="auto",
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+    # 15 minutely nowcast ===============================================
+    def forecast_minutely_15(self, latitude: float, longitude: float, **kwargs):
+        url = base_url + f"?latitude={latitude}&longitude={longitude}"
+        if "minutely_15" in kwargs:
+            minutely_fields = ",".join(kwargs.get("minutely_15"))
+            url = url + f"&minutely_15={minutely_fields}"
+
+        # Number of 15 minute steps before and after now
+        if "forecast_minutely_15" in kwargs:
+            url = url + f"&forecast_minutely_15={kwargs.get('forecast_minutely_15')}"
+        if "past_minutely_15" in kwargs:
+            url = url + f"&past_minutely_15={kwargs.get('past_minutely_15')}"
+
+        url = url + "&timeformat=unixtime"
+        return get_json("minutely_15", url, name="weather.minutely_15")
+
+    def _get_nowcast(self, lat, lon, steps=8):
+        # Next two hours by default, the current step is included
+        return self.forecast_minutely_15(
+            lat,
+            lon,
+            minutely_15=fieldRegistry.fields("minutely_15"),
+            forecast_minutely_15=steps,
+            past_minutely_15=1,
         )
 
     # Forecast daily ====================================================
-    @classmethod
-    def forecast_daily(cls,latitude: float, longitude: float, **kwargs):
+    def forecast_daily(self, latitude: float, longitude: float, **kwargs):
         url = base_url + f"?latitude={latitude}&longitude={longitude}"
         if "daily" in kwargs:
             hourly_fields = ",".join(kwargs.get("daily"))
@@ -106,31 +151,24 @@ class Weather:
 
         if "timezone" in kwargs:
             url = url + f"&timezone={kwargs.get('timezone')}"
-        if "start_date" in kwargs:
-            url = url + f"&start_date={kwargs.get('start_date')}"
 
-        if "end_date" in kwargs:
-            url = url + f"&end_date={kwargs.get('end_date')}" 
-
-        try:
-            url = url + "&timeformat=unixtime" + extend_url
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception if the request was unsuccessful
-            data = response.json()
-            return data
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-
-    def _get_daily_forecast(self, lat, lon):
-        daily_args = [
-            "weathercode",
-            "temperature_2m_max",
-            "temperature_2m_min",
-            "sunrise",
-            "sunset",
-            "uv_index_max",
-            "precipitation_sum",
-            "windspeed_10m_max",
-        ]
-
-        return self.forecast_daily(lat, lon, daily=daily_args, timezone="GMT")
+        url = url + self._horizon_params(**kwargs)
+        url = url + "&timeformat=unixtime" + self.extend_url
+        return get_json("weather", url, name="weather.daily")
+
+    def _get_daily_forecast(self, lat, lon, start_date=None, end_date=None):
+        daily_args = fieldRegistry.fields("daily")
+
+        # Days from midnight to midnight of the location, the response
+        # carries its utc_offset_seconds
+        if start_date is None:
+            return self.forecast_daily(lat, lon, daily=daily_args, timezone="auto")
+
+        return self.forecast_daily(
+            lat,
+            lon,
+            daily=daily_args,
+            timezone="auto",
+            start_date=start_date,
+            end_date=end_date,
+        )
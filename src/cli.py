@@ -0,0 +1,211 @@
+import sys
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .backendWeather import Weather
+from .backendAirPollution import AirPollution
+from .backendFindCity import find_city
+from .backendTransport import TransportError
+from . import fieldRegistry
+from .Models import CurrentWeather, AirQuality
+from .constants import conditon
+from .weatherData import (
+    classify_humidity_level,
+    classify_presssure_level,
+    classify_wind_speed_level,
+    classify_uv_index,
+    aqi_category_label,
+)
+
+# Headless entry point, `mousam --cli` prints the current conditions of
+# the given cities (or the added ones) and `mousam --json` prints them as
+# json. Nothing here imports GTK.
+
+MAX_WORKERS = 8
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="mousam", description="Print current weather without the GUI."
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--cli", action="store_true", help="human readable output")
+    mode.add_argument("--json", action="store_true", help="json output")
+    parser.add_argument(
+        "cities",
+        nargs="*",
+        help='city names or "lat,lon", the added cities when omitted',
+    )
+    parser.add_argument("--unit", choices=["metric", "imperial"], default=None)
+    parser.add_argument(
+        "--no-air", action="store_true", help="skip the air quality request"
+    )
+    return parser.parse_args(argv)
+
+
+# ============ Cities ============
+def _parse_cords(text):
+    parts = text.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        return float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+
+
+def resolve_city(text):
+    """(name, lat, lon) of a "lat,lon" string or the best geocoding match."""
+    cords = _parse_cords(text)
+    if cords is not None:
+        return (text, *cords)
+
+    matches = find_city(text, 1)
+    if not matches:
+        return None
+    loc = matches[0]
+    name = ",".join(x for x in [loc.name, loc.country] if x)
+    return (name, loc.latitude, loc.longitude)
+
+
+def added_cities():
+    from .config import settings
+
+    cities = []
+    for city in settings.added_cities:
+        parts = city.split(",")
+        cities.append((",".join(parts[:-2]), float(parts[-2]), float(parts[-1])))
+    return cities
+
+
+# ============ Fetching ============
+def fetch_city(name, lat, lon, unit, with_air):
+    weather = CurrentWeather(Weather(unit)._get_current_weather(lat, lon))
+    result = {
+        "name": name,
+        "latitude": lat,
+        "longitude": lon,
+        "time": weather.time.get("data"),
+        "condition": conditon[str(weather.weathercode.get("data"))],
+        "is_day": weather.is_day.get("data") == 1,
+    }
+
+    levels = {
+        "relativehumidity_2m": classify_humidity_level,
+        "surface_pressure": classify_presssure_level,
+        "windspeed_10m": classify_wind_speed_level,
+        "uv_index": classify_uv_index,
+    }
+    for field in [
+        "temperature_2m",
+        "apparent_temperature",
+        "relativehumidity_2m",
+        "surface_pressure",
+        "windspeed_10m",
+        "winddirection_10m",
+        "uv_index",
+        "precipitation",
+    ]:
+        values = getattr(weather, field)
+        result[field] = {"value": values.get("data"), "unit": values.get("unit")}
+        if field in levels and values.get("data") is not None:
+            result[field]["level"] = levels[field](values.get("data"))
+
+    if with_air:
+        air = AirQuality(AirPollution()._get_current_air_pollution(lat, lon))
+        idx = air.nearest_index(time.time())
+        result["us_aqi"] = {
+            "value": air.us_index[idx],
+            "level": aqi_category_label(air.us_category[idx]),
+            "dominant": air.us_dominant[idx],
+        }
+    return result
+
+
+def fetch_all(cities, unit, with_air):
+    results = [None] * len(cities)
+    workers = max(1, min(MAX_WORKERS, len(cities)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(fetch_city, *city, unit, with_air) for city in cities
+        ]
+        for i, future in enumerate(futures):
+            try:
+                results[i] = future.result()
+            except TransportError as e:
+                name, lat, lon = cities[i]
+                results[i] = {
+                    "name": name,
+                    "latitude": lat,
+                    "longitude": lon,
+                    "error": str(e),
+                }
+    return results
+
+
+# ============ Output ============
+def format_text(result):
+    if "error" in result:
+        return f"{result['name']}: {result['error']}"
+
+    def value(field):
+        data = result[field]
+        text = f"{data['value']} {data['unit']}"
+        if "level" in data:
+            text += f" ({data['level']})"
+        return text
+
+    lines = [
+        f"{result['name']} ({result['latitude']}, {result['longitude']})",
+        f"  {result['condition']}, {value('temperature_2m')}, feels like {value('apparent_temperature')}",
+        f"  Humidity: {value('relativehumidity_2m')}",
+        f"  Wind: {value('windspeed_10m')}",
+        f"  Pressure: {value('surface_pressure')}",
+        f"  UV index: {value('uv_index')}",
+        f"  Precipitation: {value('precipitation')}",
+    ]
+    if "us_aqi" in result:
+        aqi = result["us_aqi"]
+        lines.append(f"  AQI (US): {aqi['value']} ({aqi['level']})")
+    return "\n".join(lines)
+
+
+def _cities(args):
+    if args.cities:
+        cities = []
+        for text in args.cities:
+            city = resolve_city(text)
+            if city is None:
+                print(f"City not found: {text}", file=sys.stderr)
+                return None
+            cities.append(city)
+    else:
+        cities = added_cities()
+
+    if not cities:
+        print("No cities given and none added in Mousam", file=sys.stderr)
+        return None
+    return cities
+
+
+def main(argv):
+    args = parse_args(argv)
+    # Only ask the api for what is printed, the GUI views are not shown
+    fieldRegistry.set_active_views(["cli"])
+
+    # Diagnostics of the data modules are printed, keep stdout for results
+    with contextlib.redirect_stdout(sys.stderr):
+        cities = _cities(args)
+        if cities is None:
+            return 1
+        results = fetch_all(cities, args.unit, not args.no_air)
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print("\n\n".join(format_text(result) for result in results))
+
+    return 1 if all("error" in result for result in results) else 0
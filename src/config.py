@@ -1,90 +1,234 @@
-from gi.repository import Gio
+import os
+from collections import namedtuple
+
+APP_ID = "io.github.amit9838.mousam"
+
+# Set MOUSAM_SETTINGS=memory to run without GSettings (tests, workers)
+SETTINGS_ENV = "MOUSAM_SETTINGS"
+
+# Defaults of the keys, same as in the gschema
+DEFAULTS = {
+    "added-cities": [],
+    "selected-city": "",
+    "use-gradient-bg": True,
+    "use-inch-for-prec": False,
+    "use-24h-clock": False,
+    "window-width": 1160,
+    "window-height": 818,
+    "window-maximized": False,
+    "refresh-all-cities": False,
+    "record-history": False,
+    "unit": "metric",
+}
+
+
+Coordinates = namedtuple("Coordinates", ["latitude", "longitude"])
+
+
+class MemoryStore:
+    """Settings kept in a dict, same getters and setters as Gio.Settings."""
+
+    def __init__(self, values=None):
+        self.values = dict(DEFAULTS)
+        self.values.update(values or {})
+
+    def _get(self, key):
+        return self.values[key]
+
+    def _set(self, key, value):
+        self.values[key] = value
+        return True
+
+    def connect(self, signal, callback):
+        # Values only change through the setters, nothing to notify
+        return 0
+
+    def get_strv(self, key):
+        return list(self._get(key))
+
+    def set_strv(self, key, value):
+        return self._set(key, list(value))
+
+    get_string = get_boolean = get_int = _get
+    set_string = set_boolean = set_int = _set
+
+
+def _gsettings_store():
+    # None when gi or the installed schema is missing
+    try:
+        from gi.repository import Gio
+    except ImportError:
+        return None
+
+    source = Gio.SettingsSchemaSource.get_default()
+    if source is None or source.lookup(APP_ID, True) is None:
+        return None
+    return Gio.Settings(APP_ID)
 
 
 class Settings:
+    """Preferences of the app.
+
+    Backed by GSettings when it is available, otherwise (or with
+    MOUSAM_SETTINGS=memory) by an in-memory store holding the defaults.
+    The store is created on first use, so importing this module does not
+    load gi.
+
+    Values are cached after the first read and dropped from the cache
+    when the store emits "changed", so reading a property is a dict
+    lookup.
+    """
+
     _instance = None
-    APP_ID = "io.github.amit9838.mousam"
+    APP_ID = APP_ID
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Settings, cls).__new__(cls)
-            cls._instance.init_settings()
+            cls._instance._store = None
+            cls._instance._cache = {}
         return cls._instance
 
-    def init_settings(self):
-        self.settings = Gio.Settings(self.APP_ID)
+    @property
+    def settings(self):
+        if self._store is None:
+            if os.environ.get(SETTINGS_ENV) != "memory":
+                self._store = _gsettings_store()
+            if self._store is None:
+                self._store = MemoryStore()
+            self._store.connect("changed", self._on_changed)
+        return self._store
+
+    def use_store(self, store):
+        """Replace the backing store, e.g. MemoryStore(values) in a worker."""
+        self._store = store
+        self._cache = {}
+        store.connect("changed", self._on_changed)
+
+    # ============ Cache ============
+    def _read(self, key, getter):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = getattr(self.settings, getter)(key)
+            self._cache[key] = value
+            return value
+
+    def _write(self, key, setter, value):
+        getattr(self.settings, setter)(key, value)
+        self._invalidate(key)
+
+    def _invalidate(self, key):
+        self._cache.pop(key, None)
+        if key == "selected-city":
+            self._cache.pop("selected-cords", None)
+
+    def _on_changed(self, store, key):
+        self._invalidate(key)
+
+    @property
+    def is_persistent(self):
+        return not isinstance(self.settings, MemoryStore)
 
     @property
     def added_cities(self):
-        return self.settings.get_strv("added-cities")
+        # A copy, callers are free to modify the list
+        return list(self._read("added-cities", "get_strv"))
 
     @added_cities.setter
     def added_cities(self, value):
-        self.settings.set_strv("added-cities", value)
+        self._write("added-cities", "set_strv", value)
 
     @property
     def selected_city(self):
-        return self.settings.get_string("selected-city")
+        return self._read("selected-city", "get_string")
 
     @selected_city.setter
     def selected_city(self, value):
-        self.settings.set_string("selected-city", value)
+        self._write("selected-city", "set_string", value)
+
+    @property
+    def selected_cords(self):
+        """Coordinates of the selected city, parsed once per change."""
+        try:
+            return self._cache["selected-cords"]
+        except KeyError:
+            lat, lon = self.selected_city.split(",")
+            cords = Coordinates(float(lat), float(lon))
+            self._cache["selected-cords"] = cords
+            return cords
 
     @property
     def is_using_dynamic_bg(self):
-        return self.settings.get_boolean("use-gradient-bg")
+        return self._read("use-gradient-bg", "get_boolean")
 
     @is_using_dynamic_bg.setter
     def is_using_dynamic_bg(self, value):
-        self.settings.set_boolean("use-gradient-bg", value)
+        self._write("use-gradient-bg", "set_boolean", value)
 
     @property
     def is_using_inch_for_prec(self):
-        return self.settings.get_boolean("use-inch-for-prec")
+        return self._read("use-inch-for-prec", "get_boolean")
 
     @is_using_inch_for_prec.setter
     def is_using_inch_for_prec(self, value):
-        self.settings.set_boolean("use-inch-for-prec", value)
+        self._write("use-inch-for-prec", "set_boolean", value)
 
     @property
     def is_using_24h_clock(self):
-        return self.settings.get_boolean("use-24h-clock")
+        return self._read("use-24h-clock", "get_boolean")
 
     @is_using_24h_clock.setter
     def is_using_24h_clock(self, value):
-        self.settings.set_boolean("use-24h-clock", value)
+        self._write("use-24h-clock", "set_boolean", value)
 
     @property
     def window_width(self):
-        return self.settings.get_int("window-width")
+        return self._read("window-width", "get_int")
 
     @window_width.setter
     def window_width(self, value):
-        self.settings.set_int("window-width", value)
+        self._write("window-width", "set_int", value)
 
     @property
     def window_height(self):
-        return self.settings.get_int("window-height")
+        return self._read("window-height", "get_int")
 
     @window_height.setter
     def window_height(self, value):
-        self.settings.set_int("window-height", value)
+        self._write("window-height", "set_int", value)
 
     @property
     def window_maximized(self):
-        return self.settings.get_boolean("window-maximized")
+        return self._read("window-maximized", "get_boolean")
 
     @window_maximized.setter
     def window_maximized(self, value):
-        self.settings.set_boolean("window-maximized", value)
+        self._write("window-maximized", "set_boolean", value)
+
+    @property
+    def should_refresh_all_cities(self):
+        return self._read("refresh-all-cities", "get_boolean")
+
+    @should_refresh_all_cities.setter
+    def should_refresh_all_cities(self, value):
+        self._write("refresh-all-cities", "set_boolean", value)
+
+    @property
+    def is_recording_history(self):
+        return self._read("record-history", "get_boolean")
+
+    @is_recording_history.setter
+    def is_recording_history(self, value):
+        self._write("record-history", "set_boolean", value)
 
     @property
     def unit(self):
-        return self.settings.get_string("unit")
+        return self._read("unit", "get_string")
 
     @unit.setter
     def unit(self, value):
-        self.settings.set_string("unit", value)
+        self._write("unit", "set_string", value)
 
 
 def get_settings():
@@ -1,6 +1,7 @@
 from gettext import gettext as _
 
-icon_loc = "@icon_location@/share/icons/hicolor/scalable/mousam_icons/"
+# Resource paths of the weather icons bundled in mousam.gresource
+icon_loc = "/io/github/amit9838/mousam/icons/"
 
 icons = {
     "0": icon_loc + "clear-day.svg",
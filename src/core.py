@@ -0,0 +1,88 @@
+# Data layer of Mousam without GTK: backends, models, settings and the
+# derived levels. Everything imported here must stay importable without gi,
+# the GUI modules (frontend*, window*, mousam, refreshScheduler) build on it.
+#
+#   from mousam.core import Weather, CurrentWeather
+#
+# MOUSAM_SETTINGS=memory (or settings.use_store(MemoryStore(...))) runs it
+# without GSettings, e.g. in tests and worker processes.
+
+from .config import settings, Settings, MemoryStore
+from .backendTransport import get_json, TransportError
+from .backendWeather import Weather, MAX_FORECAST_DAYS, MAX_PAST_DAYS
+from .backendAirPollution import AirPollution
+from .backendFindCity import find_city
+from .Models import (
+    CurrentWeather,
+    HourlyWeather,
+    DailyWeather,
+    NowcastWeather,
+    AirQuality,
+    Location,
+    Measurement,
+)
+from .derivedMetrics import (
+    ThresholdTable,
+    UV_INDEX,
+    HUMIDITY,
+    PRESSURE,
+    WIND_SPEED,
+    US_AQI,
+    EUROPEAN_AQI,
+    derive_levels,
+    aggregate_days,
+)
+from .timeAxis import TimeAxis
+from .solarPosition import sun_times, elevation, day_length
+from .weatherData import (
+    classify_aqi,
+    classify_uv_index,
+    classify_humidity_level,
+    classify_presssure_level,
+    classify_wind_speed_level,
+    transform_visibility_data,
+)
+from .historyStore import HistoryStore, get_history_store
+from . import fieldRegistry
+
+__all__ = [
+    "settings",
+    "Settings",
+    "MemoryStore",
+    "get_json",
+    "TransportError",
+    "Weather",
+    "MAX_FORECAST_DAYS",
+    "MAX_PAST_DAYS",
+    "AirPollution",
+    "find_city",
+    "CurrentWeather",
+    "HourlyWeather",
+    "DailyWeather",
+    "NowcastWeather",
+    "AirQuality",
+    "Location",
+    "Measurement",
+    "ThresholdTable",
+    "UV_INDEX",
+    "HUMIDITY",
+    "PRESSURE",
+    "WIND_SPEED",
+    "US_AQI",
+    "EUROPEAN_AQI",
+    "derive_levels",
+    "aggregate_days",
+    "TimeAxis",
+    "sun_times",
+    "elevation",
+    "day_length",
+    "classify_aqi",
+    "classify_uv_index",
+    "classify_humidity_level",
+    "classify_presssure_level",
+    "classify_wind_speed_level",
+    "transform_visibility_data",
+    "HistoryStore",
+    "get_history_store",
+    "fieldRegistry",
+]
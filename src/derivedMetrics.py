@@ -0,0 +1,184 @@
+import math
+from array import array
+from bisect import bisect_left
+
+from .renderStrings import N_, NC_, translate_all
+from .airQualityIndex import US_CATEGORY_BOUNDS, EUROPEAN_CATEGORY_BOUNDS
+
+# Levels derived from raw values (uv index -> "High" ...) are looked up in
+# threshold tables with a binary search, for a single value or a whole
+# hourly/daily series in one pass. Labels are translated once per locale.
+
+
+def below(bound):
+    """Bound for a "value < bound" band, the tables compare with <=."""
+    return math.nextafter(bound, -math.inf)
+
+
+class ThresholdTable:
+    """Levels of a metric, level i holds values <= bounds[i].
+
+    Values above the last bound get the last label, so there is one label
+    more than bounds.
+    """
+
+    def __init__(self, bounds, labels):
+        assert len(labels) == len(bounds) + 1
+        self.bounds = list(bounds)
+        self.label_ids = tuple(labels)
+
+    def category(self, value):
+        return bisect_left(self.bounds, value)
+
+    def categories(self, series):
+        """Level of every value of series, -1 for missing values."""
+        bounds = self.bounds
+        return array(
+            "b", [-1 if v is None else bisect_left(bounds, v) for v in series]
+        )
+
+    def labels(self):
+        """Translated labels, made once per locale."""
+        return translate_all(self.label_ids)
+
+    def label(self, category):
+        if category < 0:
+            return ""
+        return self.labels()[category]
+
+    def classify(self, value):
+        return self.labels()[bisect_left(self.bounds, value)]
+
+    def classify_series(self, series):
+        labels = self.labels() + ("",)  # -1 picks the empty label
+        return [labels[c] for c in self.categories(series)]
+
+
+# ============ Tables ============
+UV_INDEX = ThresholdTable(
+    [2, 5, 7, 10],
+    [
+        NC_("uvindex", "Low"),
+        NC_("uvindex", "Moderate"),
+        NC_("uvindex", "High"),
+        NC_("uvindex", "Very High"),
+        NC_("uvindex", "Extreme"),
+    ],
+)
+
+HUMIDITY = ThresholdTable(
+    [below(50), 80],
+    [
+        NC_("humidity", "Low"),
+        NC_("humidity", "Moderate"),
+        NC_("humidity", "High"),
+    ],
+)
+
+PRESSURE = ThresholdTable(
+    [below(940), 1010],
+    [
+        NC_("pressure", "Low"),
+        NC_("pressure", "Normal"),
+        NC_("pressure", "High"),
+    ],
+)
+
+WIND_SPEED = ThresholdTable(
+    [1, 25, 40, 60],
+    [
+        N_("Calm"),
+        N_("Light"),
+        NC_("wind", "Moderate"),
+        N_("Strong"),
+        NC_("wind", "Extreme"),
+    ],
+)
+
+US_AQI = ThresholdTable(
+    US_CATEGORY_BOUNDS,
+    [
+        N_("Good"),
+        N_("Moderate"),
+        N_("Poor"),
+        N_("Unhealthy"),
+        N_("Severe"),
+        N_("Hazardous"),
+    ],
+)
+
+EUROPEAN_AQI = ThresholdTable(
+    EUROPEAN_CATEGORY_BOUNDS,
+    [
+        NC_("european_aqi", "Good"),
+        NC_("european_aqi", "Fair"),
+        NC_("european_aqi", "Moderate"),
+        NC_("european_aqi", "Poor"),
+        NC_("european_aqi", "Very Poor"),
+        NC_("european_aqi", "Extremely Poor"),
+    ],
+)
+
+# Hourly and daily fields and the table their levels come from
+FIELD_TABLES = {
+    "uv_index": UV_INDEX,
+    "uv_index_max": UV_INDEX,
+    "relativehumidity_2m": HUMIDITY,
+    "surface_pressure": PRESSURE,
+    "windspeed_10m": WIND_SPEED,
+    "windspeed_10m_max": WIND_SPEED,
+}
+
+
+def derive_levels(model):
+    """Store the level of every step as field["category"] on a series model."""
+    for field, table in FIELD_TABLES.items():
+        series = getattr(model, field, None)
+        if series is not None:
+            series["category"] = table.categories(series.get("data"))
+
+
+# ============ Per day aggregates ============
+# Series that are not aggregated, labels or codes rather than amounts
+NOT_AGGREGATED = {"time", "weathercode", "is_day", "wind_direction_10m"}
+
+
+def aggregate_days(model):
+    """Store per local day aggregates of every hourly series on the model.
+
+    Days are the ones of model.axis (midnight to midnight of the location).
+    Every series gets field["day_min"], ["day_max"], ["day_sum"] and
+    ["day_argmax"] (index of the maximum in the whole series), one value per
+    day of the axis, None for a day without values.
+    """
+    day_starts = model.axis.day_starts
+
+    for field, series in vars(model).items():
+        if field in NOT_AGGREGATED or not isinstance(series, dict):
+            continue
+        values = series["data"]
+        mins, maxs, sums, argmaxs = [], [], [], []
+        for day in range(len(day_starts) - 1):
+            low = high = total = argmax = None
+            for i in range(day_starts[day], day_starts[day + 1]):
+                value = values[i]
+                if value is None:
+                    continue
+                if high is None:
+                    low = high = total = value
+                    argmax = i
+                    continue
+                total += value
+                if value < low:
+                    low = value
+                if value > high:
+                    high = value
+                    argmax = i
+            mins.append(low)
+            maxs.append(high)
+            sums.append(total)
+            argmaxs.append(argmax)
+        series["day_min"] = mins
+        series["day_max"] = maxs
+        series["day_sum"] = sums
+        series["day_argmax"] = argmaxs
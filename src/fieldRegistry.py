@@ -0,0 +1,136 @@
+import threading
+
+from .historyStore import CURRENT_FIELDS, AIR_POLLUTION_FIELDS
+
+# Which api fields every view reads, per dataset. Requests ask for the
+# fields of the active views only, so a field nobody shows is not fetched.
+#
+# view: {dataset: [fields]}
+VIEWS = {
+    # Main condition, temperature and feels like
+    "current_conditions": {
+        "current": ["temperature_2m", "apparent_temperature", "weathercode", "is_day"],
+        "hourly": ["visibility"],
+    },
+    # Wind, humidity, pressure and uv index cards
+    "condition_cards": {
+        "current": [
+            "windspeed_10m",
+            "winddirection_10m",
+            "relativehumidity_2m",
+            "surface_pressure",
+        ],
+        "hourly": ["uv_index", "dewpoint_2m"],
+    },
+    "hourly_details": {
+        "hourly": [
+            "temperature_2m",
+            "weathercode",
+            "is_day",
+            "windspeed_10m",
+            "wind_direction_10m",
+            "precipitation",
+        ],
+    },
+    "forecast": {
+        "hourly": ["temperature_2m", "weathercode", "is_day"],
+        "daily": ["weathercode", "temperature_2m_max", "temperature_2m_min"],
+    },
+    "air_pollution": {
+        "air_pollution": [
+            "us_aqi",
+            "european_aqi",
+            "pm10",
+            "pm2_5",
+            "carbon_monoxide",
+            "nitrogen_dioxide",
+            "sulphur_dioxide",
+            "ozone",
+        ],
+    },
+    "nowcast": {
+        "minutely_15": ["precipitation"],
+    },
+    "overview": {
+        "current": ["temperature_2m", "weathercode", "is_day"],
+        # Daily part of the batched request, high and low of today
+        "overview_daily": ["temperature_2m_max", "temperature_2m_min"],
+    },
+    # Observed conditions stored locally, only active while recording the
+    # history is turned on in preferences
+    "history": {
+        "current": list(CURRENT_FIELDS),
+        "air_pollution": list(AIR_POLLUTION_FIELDS),
+    },
+    # Headless output, only active when running with --cli/--json
+    "cli": {
+        "current": [
+            "temperature_2m",
+            "apparent_temperature",
+            "relativehumidity_2m",
+            "surface_pressure",
+            "windspeed_10m",
+            "winddirection_10m",
+            "uv_index",
+            "precipitation",
+            "weathercode",
+            "is_day",
+        ],
+        "air_pollution": [
+            "us_aqi",
+            "pm10",
+            "pm2_5",
+            "carbon_monoxide",
+            "nitrogen_dioxide",
+            "sulphur_dioxide",
+            "ozone",
+        ],
+    },
+}
+
+_active = {view for view in VIEWS if view not in ("cli", "history")}
+_fields_cache = {}
+_lock = threading.Lock()
+
+
+def register(view, **datasets):
+    """Add or replace the fields a view reads, e.g. register("x", hourly=[...])."""
+    with _lock:
+        VIEWS[view] = {dataset: list(fields) for dataset, fields in datasets.items()}
+        _active.add(view)
+        _fields_cache.clear()
+
+
+def set_active(view, active=True):
+    with _lock:
+        if active:
+            _active.add(view)
+        else:
+            _active.discard(view)
+        _fields_cache.clear()
+
+
+def set_active_views(views):
+    """Make exactly views active, the others are switched off."""
+    with _lock:
+        _active.clear()
+        _active.update(views)
+        _fields_cache.clear()
+
+
+def is_active(view):
+    return view in _active
+
+
+def fields(dataset):
+    """Fields of dataset read by any active view, in a stable order."""
+    with _lock:
+        cached = _fields_cache.get(dataset)
+        if cached is None:
+            seen = {}
+            for view, datasets in VIEWS.items():
+                if view in _active:
+                    for field in datasets.get(dataset, ()):
+                        seen.setdefault(field, None)
+            cached = _fields_cache[dataset] = list(seen)
+        return list(cached)
@@ -0,0 +1,276 @@
+import os
+import sys
+import time
+import atexit
+import threading
+from collections import deque
+
+import gi
+from gi.repository import Gtk, GLib
+
+from .tracing import span
+
+gi.require_version("Gtk", "4.0")
+
+# Set MOUSAM_FRAMES=1 to show frame times in a corner of the main window and
+# log janky frames and main loop stalls to stderr, MOUSAM_FRAMES=/path/to.log
+# writes the log to a file instead. Nothing is recorded when it is unset.
+#
+# Frames are timed from the window's GdkFrameClock (layout and paint
+# phases). Draw functions and callbacks decorated with @timed() and every
+# GLib idle/timeout callback are timed too, so a slow frame or a stall is
+# logged with the callbacks that ran in it. A watchdog thread samples the
+# main thread's stack when the main loop stops answering.
+FRAMES_ENV = "MOUSAM_FRAMES"
+
+_setting = os.environ.get(FRAMES_ENV, "")
+enabled = _setting != ""
+
+FRAME_BUDGET_MS = 1000 / 60
+# Frames taking longer than JANK_FACTOR budgets are logged
+JANK_FACTOR = 1.5
+# Main loop blocked for longer than this is logged as a stall
+STALL_MS = 100
+HEARTBEAT_MS = 20
+# Callbacks slower than this are logged on their own
+SLOW_CALLBACK_MS = FRAME_BUDGET_MS
+# Frames kept for the overlay statistics
+MAX_FRAMES = 600
+OVERLAY_INTERVAL = 1
+
+_frames = deque(maxlen=MAX_FRAMES)  # (layout ms, paint ms)
+_callback_stats = {}  # name: [calls, total ms, max ms]
+_frame_callbacks = deque(maxlen=64)  # (name, ms) of callbacks of the current frame
+_running = []  # timed callbacks running on the main thread, innermost last
+_counts = {"janky": 0, "stalls": 0}
+_log_file = None
+_main_thread = threading.main_thread()
+_installed = False
+_package_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Sources of the profiler itself are not timed
+_timeout_add = GLib.timeout_add
+_timeout_add_seconds = GLib.timeout_add_seconds
+
+
+def log(message):
+    global _log_file
+    if _log_file is None:
+        if _setting in ("1", "stderr"):
+            _log_file = sys.stderr
+        else:
+            _log_file = open(_setting, "a", buffering=1)
+    print(f"[frames {time.monotonic():.3f}] {message}", file=_log_file)
+
+
+def _record_callback(name, ms):
+    stats = _callback_stats.get(name)
+    if stats is None:
+        stats = _callback_stats[name] = [0, 0.0, 0.0]
+    stats[0] += 1
+    stats[1] += ms
+    if ms > stats[2]:
+        stats[2] = ms
+    _frame_callbacks.append((name, ms))
+    if ms > SLOW_CALLBACK_MS:
+        log(f"slow callback {name}: {ms:.1f} ms")
+
+
+def timed(name=None):
+    """Decorator timing a draw function or callback, a no-op when disabled."""
+
+    def decorator(func):
+        if not enabled:
+            return func
+        callback_name = name or func.__qualname__
+
+        def wrapper(*args, **kwargs):
+            on_main = threading.current_thread() is _main_thread
+            if on_main:
+                _running.append(callback_name)
+            start = time.perf_counter()
+            try:
+                with span(callback_name, cat="ui"):
+                    return func(*args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - start) * 1000
+                if on_main:
+                    _running.pop()
+                    _record_callback(callback_name, ms)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    return decorator
+
+
+# ============ GLib sources ============
+def _timed_source(add_source, callback_pos):
+    # Wraps GLib.idle_add / GLib.timeout_add so their callbacks are timed
+    def add(*args, **kwargs):
+        args = list(args)
+        func = args[callback_pos]
+        name = "idle." + getattr(func, "__qualname__", repr(func))
+        args[callback_pos] = timed(name)(func)
+        return add_source(*args, **kwargs)
+
+    return add
+
+
+def _time_glib_sources():
+    GLib.idle_add = _timed_source(GLib.idle_add, 0)
+    GLib.timeout_add = _timed_source(GLib.timeout_add, 1)
+    GLib.timeout_add_seconds = _timed_source(GLib.timeout_add_seconds, 1)
+
+
+# ============ Frame clock ============
+class _FrameTimer:
+    def __init__(self):
+        self.layout_start = 0
+        self.paint_start = 0
+
+    def connect(self, frame_clock):
+        frame_clock.connect("before-paint", self._on_before_paint)
+        frame_clock.connect("layout", self._on_layout)
+        frame_clock.connect("paint", self._on_paint)
+        frame_clock.connect("after-paint", self._on_after_paint)
+
+    def _on_before_paint(self, frame_clock):
+        _frame_callbacks.clear()
+        self.layout_start = self.paint_start = time.perf_counter()
+
+    def _on_layout(self, frame_clock):
+        self.layout_start = time.perf_counter()
+
+    def _on_paint(self, frame_clock):
+        self.paint_start = time.perf_counter()
+
+    def _on_after_paint(self, frame_clock):
+        end = time.perf_counter()
+        layout_ms = (self.paint_start - self.layout_start) * 1000
+        paint_ms = (end - self.paint_start) * 1000
+        _frames.append((layout_ms, paint_ms))
+
+        if layout_ms + paint_ms > FRAME_BUDGET_MS * JANK_FACTOR:
+            _counts["janky"] += 1
+            slowest = sorted(_frame_callbacks, key=lambda c: -c[1])[:3]
+            culprits = ", ".join(f"{name} {ms:.1f} ms" for name, ms in slowest)
+            log(
+                f"janky frame: layout {layout_ms:.1f} ms, paint {paint_ms:.1f} ms"
+                + (f" ({culprits})" if culprits else "")
+            )
+
+
+# ============ Main loop stalls ============
+class _Watchdog(threading.Thread):
+    """Notices when the main loop stops running its heartbeat timeout."""
+
+    def __init__(self):
+        super().__init__(name="frame_watchdog", daemon=True)
+        self.last_beat = time.monotonic()
+        self.stall_start = None
+        self.culprit = None
+        self.lock = threading.Lock()
+
+    def beat(self):
+        now = time.monotonic()
+        with self.lock:
+            stall_start, culprit = self.stall_start, self.culprit
+            self.stall_start = None
+            self.last_beat = now
+        if stall_start is not None:
+            _counts["stalls"] += 1
+            log(f"main loop stalled {(now - stall_start) * 1000:.0f} ms in {culprit}")
+        return True
+
+    def run(self):
+        while True:
+            time.sleep(HEARTBEAT_MS / 1000)
+            with self.lock:
+                stalled = (time.monotonic() - self.last_beat) * 1000 > STALL_MS
+                if self.stall_start is None and stalled:
+                    self.stall_start = self.last_beat
+                    self.culprit = self._sample_main_thread()
+
+    def _sample_main_thread(self):
+        # Timed callbacks running plus the innermost frame of our own code
+        frame = sys._current_frames().get(_main_thread.ident)
+        where = None
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(_package_dir):
+                code = frame.f_code
+                where = f"{os.path.basename(code.co_filename)}:{frame.f_lineno} {code.co_name}"
+                break
+            frame = frame.f_back
+
+        names = list(_running)
+        if where is not None:
+            names.append(where)
+        return " > ".join(names) if names else "GTK"
+
+
+# ============ Overlay ============
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _update_overlay(label):
+    if label.get_root() is None:
+        return False
+    if _frames:
+        totals = [layout + paint for layout, paint in _frames]
+        label.set_text(
+            f"frame p50 {_percentile(totals, 0.5):.1f} ms  "
+            f"p95 {_percentile(totals, 0.95):.1f} ms  "
+            f"max {max(totals):.1f} ms\n"
+            f"janky {_counts['janky']}  stalls {_counts['stalls']}"
+        )
+    return True
+
+
+def _log_summary():
+    log(f"{_counts['janky']} janky frames, {_counts['stalls']} main loop stalls")
+    by_total = sorted(_callback_stats.items(), key=lambda item: -item[1][1])
+    for name, (calls, total, worst) in by_total[:20]:
+        log(f"  {name}: {calls} calls, {total:.1f} ms total, {worst:.1f} ms max")
+
+
+def attach(window, container):
+    """Start recording for window and show the overlay over container's child.
+
+    container is a widget with get_child/set_child holding the window
+    content (the toast overlay of the main window).
+    """
+    global _installed
+    if not enabled:
+        return
+
+    if not _installed:
+        _installed = True
+        _time_glib_sources()
+        watchdog = _Watchdog()
+        _timeout_add(HEARTBEAT_MS, watchdog.beat)
+        watchdog.start()
+        atexit.register(_log_summary)
+
+    frame_timer = _FrameTimer()
+    window.connect(
+        "realize", lambda widget: frame_timer.connect(widget.get_frame_clock())
+    )
+
+    content = container.get_child()
+    container.set_child(None)
+    overlay = Gtk.Overlay()
+    overlay.set_child(content)
+    container.set_child(overlay)
+
+    label = Gtk.Label(halign=Gtk.Align.END, valign=Gtk.Align.END)
+    label.set_margin_end(6)
+    label.set_margin_bottom(6)
+    label.set_can_target(False)
+    label.set_css_classes(["osd", "monospace", "text-7"])
+    overlay.add_overlay(label)
+    _timeout_add_seconds(OVERLAY_INTERVAL, _update_overlay, label)
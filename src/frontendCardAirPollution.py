@@ -5,6 +5,8 @@ from gi.repository import Gtk
 from gettext import gettext as _, pgettext as C_
 
 from .frontendUiDrawPollutionBar import PollutionBar
+from .frontendUiDrawAqiChart import AqiChart
+from .airQualityIndex import POLLUTANT_NAMES
 from .config import settings
 
 gi.require_version("Gtk", "4.0")
@@ -12,25 +14,17 @@ gi.require_version("Adw", "1")
 
 class CardAirPollution:
     def __init__(self):
-        from .weatherData import air_apllution_data, classify_aqi
+        from .weatherData import air_apllution_data, aqi_category_label
 
         self.air_apllution_data = air_apllution_data
-        self.classify_aqi = classify_aqi
+        self.aqi_category_label = aqi_category_label
         self.card = None
         self.create_card()
 
-    def _get_nearest_time_index(self):
-        nearest_current_time_idx = 0
-        air_poll_time = self.air_apllution_data["hourly"]["time"]
-        for i in range(len(air_poll_time)):
-            if (abs(time.time() - air_poll_time[i]) // 60) < 30:
-                nearest_current_time_idx = i
-                break
-
-        return nearest_current_time_idx
-
     def create_card(self):
-        idx = self._get_nearest_time_index()
+        data = self.air_apllution_data
+        idx = data.nearest_index(time.time())
+        aqi = data.us_index[idx] or 0
 
         card = Gtk.Grid(margin_top=6, margin_start=3)
         self.card = card
@@ -62,15 +56,13 @@ class CardAirPollution:
         info_box.set_margin_start(10)
         info_box.set_margin_top(15)
 
-        main_val = Gtk.Label(label=self.air_apllution_data["hourly"]["us_aqi"][idx])
+        main_val = Gtk.Label(label=str(aqi))
         main_val.set_css_classes(["text-l4", "bold"])
         main_val.set_halign(Gtk.Align.START)
         main_val.set_margin_end(10)
         info_box.append(main_val)
 
-        desc = Gtk.Label(
-            label=self.classify_aqi(self.air_apllution_data["hourly"]["us_aqi"][idx])
-        )
+        desc = Gtk.Label(label=self.aqi_category_label(data.us_category[idx]))
         desc.set_css_classes(["text-3", "light-2", "bold-2"])
         desc.set_margin_bottom(10)
         desc.set_valign(Gtk.Align.END)
@@ -78,9 +70,27 @@ class CardAirPollution:
         info_box.append(desc)
 
         # Pollution bar
-        aqi = self.air_apllution_data["hourly"]["us_aqi"][idx]
-
         bar_level = aqi / 350
         pollution_bar = PollutionBar(min(bar_level, 0.99))
         # pollution_bar.set_margin_top()
         card.attach(pollution_bar, 0, 4, 4, 1)
+
+        # Pollutant driving the index right now
+        dominant = data.us_dominant[idx]
+        if dominant is not None:
+            dominant_label = Gtk.Label(
+                label=_("Main pollutant: {0}").format(POLLUTANT_NAMES[dominant]),
+                halign=Gtk.Align.START,
+                margin_start=10,
+            )
+            dominant_label.set_css_classes(["text-6", "light-3", "bold-3"])
+            card.attach(dominant_label, 0, 5, 4, 1)
+
+        # Index of the next 24 hours
+        start = max(0, idx - 1)
+        end = start + 24
+        chart = AqiChart(
+            data.us_index[start:end], data.us_category[start:end], idx - start
+        )
+        chart.set_tooltip_text(_("Air quality index, next 24 hours"))
+        card.attach(chart, 0, 6, 4, 1)
@@ -1,22 +1,29 @@
-from datetime import datetime
+import time
 import gi
 
-from gi.repository import Gtk
+from gi.repository import Gtk, GLib
 from gettext import gettext as _, pgettext as C_
 
 from .frontendUiDrawDayNight import DrawDayNight
 from .config import settings
-from .utils import (
-    get_cords,
-    get_time_difference,
-)
+from .solarPosition import sun_times, elevation
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
+# Seconds between updates of the sun position, it moves < 0.5° a minute
+UPDATE_INTERVAL = 60
+
 
 class CardDayNight:
     def __init__(self):
+        from .weatherData import daily_forecast_data as daily_data
+
+        # Sun times are computed for the coordinates, the forecast only
+        # gives the location's offset from GMT
+        self.latitude, self.longitude = settings.selected_cords
+        self.axis = daily_data.axis
+
         sun_rise, sun_set, degree = self.get_sunset_sunrise_degree()
         self.sun_rise = sun_rise
         self.sun_set = sun_set
@@ -25,34 +32,38 @@ class CardDayNight:
         self.card = None
         self.create_card()
 
-    def get_sunset_sunrise_degree(self):
-        from .weatherData import daily_forecast_data as daily_data
-
-        t_data = get_time_difference(*get_cords())
-        time_diff = t_data.get("epoch_diff")
-        target_time = t_data.get("target_time")
+        # Move the sun and the clock along while the card is shown
+        GLib.timeout_add_seconds(UPDATE_INTERVAL, self._on_tick)
 
-        sunrise_ts, sunset_ts = 0, 0
-        for i, data in enumerate(daily_data.time.get("data")):
-            date_ = int(datetime.fromtimestamp(data + time_diff).strftime(r"%d"))
-            if date_ == datetime.today().date().day:
-                sunrise_ts = daily_data.sunrise.get("data")[i]
-                sunset_ts = daily_data.sunset.get("data")[i]
-                break
+    def get_sunset_sunrise_degree(self, now=None):
+        if now is None:
+            now = time.time()
+        today = self.axis.day_of(now)
+        sunrise_ts, sunset_ts, noon = sun_times(
+            self.latitude, self.longitude, today, self.axis.utc_offset
+        )
 
-        target_dt = datetime.fromtimestamp(target_time)
-        sunrise_dt = datetime.fromtimestamp(sunrise_ts - time_diff)
-        sunset_dt = datetime.fromtimestamp(sunset_ts - time_diff)
-
-        sunrise = sunrise_dt.strftime("%I:%M %p")
-        sunset = sunset_dt.strftime("%I:%M %p")
+        angle = self._calculate_sun_rotation(now, today)
+        return self._format_time(sunrise_ts), self._format_time(sunset_ts), angle
 
+    def _format_time(self, ts):
+        # Clock time in the location, "-" on days the sun does not rise or set
+        if ts is None:
+            return "-"
         if settings.is_using_24h_clock:
-            sunrise = sunrise_dt.strftime("%H:%M")
-            sunset = sunset_dt.strftime("%H:%M")
+            return self.axis.local_datetime(ts).strftime("%H:%M")
+        return self.axis.local_datetime(ts).strftime("%I:%M %p")
+
+    def _on_tick(self):
+        if self.card.get_root() is None:
+            # Card was replaced, stop updating it
+            return False
 
-        angle = self._calculate_sun_rotation(target_dt, sunrise_dt, sunset_dt)
-        return sunrise, sunset, angle
+        self.sun_rise, self.sun_set, self.degree = self.get_sunset_sunrise_degree()
+        self.sun_rise_label.set_text(self.sun_rise)
+        self.sun_set_label.set_text(self.sun_set)
+        self.day_night.set_position(self.degree, self._format_time(time.time()))
+        return True
 
     def create_card(self):
         card = Gtk.Grid(margin_top=6, margin_start=3, margin_bottom=0)
@@ -84,6 +95,7 @@ class CardDayNight:
         card_info.attach(sun_rise_label, 0, 1, 1, 2)
 
         sun_rise = Gtk.Label(label=self.sun_rise)
+        self.sun_rise_label = sun_rise
         sun_rise.set_margin_top(5)
         sun_rise.set_css_classes(["text-2a", "bold", "light-2"])
         sun_rise.set_halign(Gtk.Align.START)
@@ -96,6 +108,7 @@ class CardDayNight:
         card_info.attach(sun_set_label, 0, 4, 1, 2)
 
         sun_set = Gtk.Label(label=self.sun_set)
+        self.sun_set_label = sun_set
         sun_set.set_css_classes(["text-2a", "bold", "light-2"])
         sun_set.set_halign(Gtk.Align.START)
         card_info.attach(sun_set, 0, 6, 3, 3)
@@ -107,33 +120,28 @@ class CardDayNight:
 
         card.attach(card_icon, 1, 2, 2, 1)
 
-        obj = DrawDayNight(self.degree, 120, 90)
-        card_icon.attach(obj.img_box, 0, 1, 1, 1)
+        self.day_night = DrawDayNight(
+            self.degree, 120, 90, self._format_time(time.time())
+        )
+        card_icon.attach(self.day_night.img_box, 0, 1, 1, 1)
 
     # Sun Rotation
-    def _calculate_sun_rotation(self, target_dt, sunrise_dt, sunset_dt):
-        angle = 0
-        target_ctime_hr = target_dt.hour + (target_dt.minute / 60)
-        target_sunrise_hr = sunrise_dt.hour + (sunrise_dt.minute / 60)
-        target_sunset_hr = sunset_dt.hour + (sunset_dt.minute / 60)
-
-        # day
-        if target_ctime_hr > target_sunrise_hr and target_ctime_hr < target_sunset_hr:
-            angle = (
-                (target_ctime_hr - target_sunrise_hr)
-                * 180
-                / (target_sunset_hr - target_sunrise_hr)
-            )
-            angle += 180  # Sun is above the horizon
-
-        # Night
+    def _calculate_sun_rotation(self, now, today):
+        # 180° to 360° from sunrise to sunset, 0° to 180° through the night
+        lat, lon, offset = self.latitude, self.longitude, self.axis.utc_offset
+        sunrise, sunset, noon = sun_times(lat, lon, today, offset)
+
+        if sunrise is None:
+            # Polar day or night, the sun stays at the top or the bottom
+            return 270 if elevation(lat, lon, noon) > 0 else 90
+
+        if sunrise <= now < sunset:
+            return 180 + (now - sunrise) * 180 / (sunset - sunrise)
+
+        if now >= sunset:
+            last_sunset = sunset
+            next_sunrise = sun_times(lat, lon, today + 1, offset)[0] or sunrise + 86400
         else:
-            if target_ctime_hr < target_sunrise_hr:
-                target_ctime_hr += 24  # Adjust for times after midnight
-            angle = (
-                (target_ctime_hr - target_sunset_hr)
-                * 180
-                / (24 - (target_sunset_hr - target_sunrise_hr))
-            )
-
-        return angle
+            last_sunset = sun_times(lat, lon, today - 1, offset)[1] or sunset - 86400
+            next_sunrise = sunrise
+        return (now - last_sunset) * 180 / (next_sunrise - last_sunset)
@@ -4,11 +4,29 @@ from .constants import icons
 from .config import settings
 from .frontendUiDrawBar import DrawLevelBar
 from .frontendUiDrawImageIcon import DrawImage
-from gettext import gettext as _, pgettext as C_
+from .renderStrings import N_, translate, translate_all
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
+WIND_DIRECTIONS = (
+    N_("North"),
+    N_("Northeast"),
+    N_("East"),
+    N_("Southeast"),
+    N_("South"),
+    N_("Southwest"),
+    N_("West"),
+    N_("Northwest"),
+)
+
+TITLES = {
+    "wind": N_("Wind"),
+    "pressure": N_("Pressure"),
+    "humidity": N_("Humidity"),
+    "uv index": N_("UV Index"),
+}
+
 
 class CardSquare:
     def __init__(
@@ -157,27 +175,11 @@ class CardSquare:
         card_icon.attach(icon_bottom_text, 0, 2, 1, 1)
 
     def _get_wind_dir(self, angle):
-        directions = [
-            _("North"),
-            _("Northeast"),
-            _("East"),
-            _("Southeast"),
-            _("South"),
-            _("Southwest"),
-            _("West"),
-            _("Northwest"),
-            _("North")
-        ]
+        directions = translate_all(WIND_DIRECTIONS)
 
         angle = angle % 360
         index = round(angle / 45) % 8
         return directions[index]
 
     def _get_translasable_title(self,title):
-        titles = {
-            "wind":_("Wind"),
-            "pressure":_("Pressure"),
-            "humidity":_("Humidity"),
-            "uv index":_("UV Index"),
-        }
-        return titles[title.lower()]
+        return translate(TITLES[title.lower()])
@@ -37,7 +37,7 @@ class CurrentCondition(Gtk.Grid):
         if data.is_day.get("data") == 0:
             condition_icon = icons[str(weather_code) + "n"]
 
-        icon_main = Gtk.Image().new_from_file(condition_icon)
+        icon_main = Gtk.Image.new_from_resource(condition_icon)
         icon_main.set_hexpand(True)
         icon_main.set_pixel_size(64)
         condition_grid.attach(icon_main, 0, 0, 1, 2)
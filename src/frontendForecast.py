@@ -1,13 +1,18 @@
-from datetime import datetime, timedelta
+import threading
 import gi
-from gi.repository import Gtk, Pango
+from gi.repository import Gtk, GLib, Pango
 from gettext import gettext as _
 from .constants import icons
 from .config import settings
+from .renderStrings import N_, translate, time_label, weekday_label
+from .frameProfiler import timed
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
+TODAY = N_("Today")
+TOMORROW = N_("Tomorrow")
+
 
 class Forecast(Gtk.Grid):
     def __init__(self, *args, **kwargs):
@@ -19,6 +24,8 @@ class Forecast(Gtk.Grid):
         self.set_css_classes(["view", "card", "custom_card"])
         if settings.is_using_dynamic_bg:
             self.add_css_class("transparent_5")
+        self.weekly_count = 0
+        self.is_loading_more = False
         self.paint_ui()
 
     def paint_ui(self):
@@ -58,6 +65,7 @@ class Forecast(Gtk.Grid):
         self.page_stacks("tomorrow")
 
     # ============= Button Click Methods ==============
+    @timed("forecast.switch_page")
     def _on_tomorrow_forecast_btn_clicked(self, widget):
         page_name = "tomorrow"
         if self.forecast_stack.get_child_by_name(page_name):
@@ -65,6 +73,7 @@ class Forecast(Gtk.Grid):
             return
         self.page_stacks("tomorrow")
 
+    @timed("forecast.switch_page")
     def _on_weekly_btn_forecast_btn_clicked(self, widget):
         page_name = "weekly"
         if self.forecast_stack.get_child_by_name(page_name):
@@ -75,7 +84,6 @@ class Forecast(Gtk.Grid):
         # ============ Add items to Stack [Tomorrow/Week] =============
 
     def page_stacks(self, page_name):
-        from .weatherData import daily_forecast_data as daily_data
         from .weatherData import hourly_forecast_data as hourly_data
 
         # Create box and add it stack
@@ -102,111 +110,135 @@ class Forecast(Gtk.Grid):
         idx_offset = 0
 
         if page_name != "weekly":
-            items_range = 24
-            idx_offset = self.get_idx_offset(hourly_data)
+            # Hours of tomorrow in the location's time
+            axis = hourly_data.axis
+            tomorrow = max(0, axis.today()) + 1
+            if tomorrow < len(axis):
+                idx_offset, end = axis.day_range(tomorrow)
+                items_range = end - idx_offset
+            else:
+                items_range = 0
 
         # -------- Plot items -------
         for idx in range(items_range):
-            forecast_item_grid = Gtk.Grid(hexpand=True, margin_top=6)
-            forecast_item_grid.set_css_classes(
-                ["bg_light_grey", "custom_card_forecast_item"]
-            )
-            forecast_container.append(forecast_item_grid)
-
-            ts = hourly_data.time.get("data")[idx + idx_offset]
-            date_time = datetime.fromtimestamp(ts)
-            dt_label = date_time.strftime("%I:%M %p")
-
-            if settings.is_using_24h_clock:
-                dt_label = date_time.strftime("%H:%M")
-
-            temp_max_text = hourly_data.temperature_2m.get("data")[idx + idx_offset]
-            temp_min_text = 0
-            weather_code = hourly_data.weathercode.get("data")[idx + idx_offset]
-
-            if page_name == "weekly":
-                ts = daily_data.time.get("data")[idx + idx_offset]
-                date_time = datetime.fromtimestamp(ts)
-                dt_label = date_time.strftime("%A")
-                temp_min_text = daily_data.temperature_2m_min.get("data")[
-                    idx + idx_offset
-                ]
-                temp_max_text = daily_data.temperature_2m_max.get("data")[
-                    idx + idx_offset
-                ]
-                weather_code = daily_data.weathercode.get("data")[idx + idx_offset]
-
-                if date_time.date().day == datetime.today().date().day:
-                    dt_label = _("Today")
-                elif (
-                    date_time.date().day
-                    == (datetime.today() + timedelta(days=1)).date().day
-                ):
-                    dt_label = _("Tomorrow")
-
-            # Add dt_label Label
-            label_box = Gtk.Box()
-            label_box.set_size_request(70, 60) # Adjusted width for better balance
-            label_day_time = Gtk.Label(label=dt_label, halign=Gtk.Align.START)
-            label_day_time.set_css_classes(["text-5", "bold-2", "light-2"])
-            # Make labels compress better with ellipsis if too narrow
-            label_day_time.set_ellipsize(Pango.EllipsizeMode.END)
-            label_day_time.set_max_width_chars(8)
-            label_box.append(label_day_time)
-            forecast_item_grid.attach(label_box, 0, 0, 1, 1)
-
-            # Condition Icon (if night)
-            if hourly_data.is_day.get("data")[idx + idx_offset] == 0:
-                weather_code = str(weather_code) + "n"
-
-            # Condition icon =====
-            condition_icon = Gtk.Image().new_from_file(icons[str(weather_code)])
-            condition_icon.set_halign(Gtk.Align.CENTER)
-            condition_icon.set_hexpand(True)
-            condition_icon.set_pixel_size(32) # Reduced from 43 to 32
-            forecast_item_grid.attach(condition_icon, 1, 0, 1, 1)
-
-            forecast_cond_grid = Gtk.Grid(valign=Gtk.Align.CENTER, margin_end=10) # Reduced from 20 to 10
-            forecast_item_grid.attach(forecast_cond_grid, 2, 0, 1, 1)
-
-            # Temp label grid =====
-            temp_label_grid = Gtk.Grid(valign=Gtk.Align.CENTER)
-            forecast_item_grid.attach(temp_label_grid, 3, 0, 1, 1)
-
-            # Max temp label ======
-            temp_max = Gtk.Label(
-                label=f"{temp_max_text:.0f}° ",
-                margin_start=5, # Reduced from 10 to 5
+            forecast_container.append(self._create_item(page_name, idx, idx_offset))
+
+        # Days after the first week are loaded when scrolled to the bottom
+        if page_name == "weekly":
+            self.weekly_count = items_range
+            scrolled_window.connect(
+                "edge-reached", self._on_weekly_edge_reached, forecast_container
             )
-            temp_max.set_css_classes(["text-4", "bold-2"])
-            temp_label_grid.attach(temp_max, 1, 0, 1, 1)
-
-            # Min temp label ======
-            if page_name == "weekly":
-                temp_min = Gtk.Label(label=f" {temp_min_text:.0f}°", margin_top=5)
-                temp_min.set_css_classes(["light-5"])
-                temp_label_grid.attach(temp_min, 1, 1, 1, 1)
-
-    # ============ get timestamp of upcomming 12:00 AM ====================
-    def get_upcomming_12am(self):
-        # Get current date and time
-        current_time = datetime.now()
-
-        # Set time to 12:00 AM
-        upcoming_12am = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-
-        # If the current time is already past 12:00 AM, get the timestamp for the next day
-        if current_time >= upcoming_12am:
-            upcoming_12am += timedelta(days=1)
-
-        # Convert to timestamp
-        return upcoming_12am.timestamp()
-
-    # =========== Return index offset from hourly forecast to get tomorrow's weather condition ====================
-    def get_idx_offset(self, hourly_data):
-        idx_off = 0
-        upcomming_12am = self.get_upcomming_12am()
-        for t in hourly_data.time.get("data"):
-            if t > upcomming_12am:
-                return idx_off
-            idx_off += 1
+
+    # ============ Single forecast row =============
+    def _create_item(self, page_name, idx, idx_offset):
+        from .weatherData import daily_forecast_data as daily_data
+        from .weatherData import hourly_forecast_data as hourly_data
+
+        forecast_item_grid = Gtk.Grid(hexpand=True, margin_top=6)
+        forecast_item_grid.set_css_classes(
+            ["bg_light_grey", "custom_card_forecast_item"]
+        )
+
+        ts = hourly_data.time.get("data")[idx + idx_offset]
+        dt_label = time_label(ts, hourly_data.utc_offset_seconds)
+
+        temp_max_text = hourly_data.temperature_2m.get("data")[idx + idx_offset]
+        temp_min_text = 0
+        weather_code = hourly_data.weathercode.get("data")[idx + idx_offset]
+
+        if page_name == "weekly":
+            ts = daily_data.time.get("data")[idx + idx_offset]
+            dt_label = weekday_label(ts, daily_data.utc_offset_seconds)
+            temp_min_text = daily_data.temperature_2m_min.get("data")[
+                idx + idx_offset
+            ]
+            temp_max_text = daily_data.temperature_2m_max.get("data")[
+                idx + idx_offset
+            ]
+            weather_code = daily_data.weathercode.get("data")[idx + idx_offset]
+
+            days_ahead = daily_data.axis.day_index(ts) - daily_data.axis.today()
+            if days_ahead == 0:
+                dt_label = translate(TODAY)
+            elif days_ahead == 1:
+                dt_label = translate(TOMORROW)
+
+        # Add dt_label Label
+        label_box = Gtk.Box()
+        label_box.set_size_request(70, 60) # Adjusted width for better balance
+        label_day_time = Gtk.Label(label=dt_label, halign=Gtk.Align.START)
+        label_day_time.set_css_classes(["text-5", "bold-2", "light-2"])
+        # Make labels compress better with ellipsis if too narrow
+        label_day_time.set_ellipsize(Pango.EllipsizeMode.END)
+        label_day_time.set_max_width_chars(8)
+        label_box.append(label_day_time)
+        forecast_item_grid.attach(label_box, 0, 0, 1, 1)
+
+        # Condition Icon (if night)
+        if hourly_data.is_day.get("data")[idx + idx_offset] == 0:
+            weather_code = str(weather_code) + "n"
+
+        # Condition icon =====
+        condition_icon = Gtk.Image.new_from_resource(icons[str(weather_code)])
+        condition_icon.set_halign(Gtk.Align.CENTER)
+        condition_icon.set_hexpand(True)
+        condition_icon.set_pixel_size(32) # Reduced from 43 to 32
+        forecast_item_grid.attach(condition_icon, 1, 0, 1, 1)
+
+        forecast_cond_grid = Gtk.Grid(valign=Gtk.Align.CENTER, margin_end=10) # Reduced from 20 to 10
+        forecast_item_grid.attach(forecast_cond_grid, 2, 0, 1, 1)
+
+        # Temp label grid =====
+        temp_label_grid = Gtk.Grid(valign=Gtk.Align.CENTER)
+        forecast_item_grid.attach(temp_label_grid, 3, 0, 1, 1)
+
+        # Max temp label ======
+        temp_max = Gtk.Label(
+            label=f"{temp_max_text:.0f}° ",
+            margin_start=5, # Reduced from 10 to 5
+        )
+        temp_max.set_css_classes(["text-4", "bold-2"])
+        temp_label_grid.attach(temp_max, 1, 0, 1, 1)
+
+        # Min temp label ======
+        if page_name == "weekly":
+            temp_min = Gtk.Label(label=f" {temp_min_text:.0f}°", margin_top=5)
+            temp_min.set_css_classes(["light-5"])
+            temp_label_grid.attach(temp_min, 1, 1, 1, 1)
+
+        return forecast_item_grid
+
+    # ============ Load days after the first week =============
+    def _on_weekly_edge_reached(self, scrolled_window, pos, forecast_container):
+        if pos != Gtk.PositionType.BOTTOM or self.is_loading_more:
+            return
+
+        from .weatherData import daily_forecast_data as daily_data
+
+        if self.weekly_count < len(daily_data.time.get("data")):
+            self._append_days(forecast_container)
+            return
+
+        self.is_loading_more = True
+        thread = threading.Thread(
+            target=self._load_more_days, args=(forecast_container,), name="load_days"
+        )
+        thread.start()
+
+    def _load_more_days(self, forecast_container):
+        from .weatherData import extend_daily_forecast
+
+        try:
+            extend_daily_forecast()
+        except Exception as e:
+            print(f"Error: {e}")
+        GLib.idle_add(self._append_days, forecast_container)
+
+    def _append_days(self, forecast_container):
+        from .weatherData import daily_forecast_data as daily_data
+
+        self.is_loading_more = False
+        for idx in range(self.weekly_count, len(daily_data.time.get("data"))):
+            forecast_container.append(self._create_item("weekly", idx, 0))
+        self.weekly_count = len(daily_data.time.get("data"))
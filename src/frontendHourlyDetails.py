@@ -1,20 +1,25 @@
-import datetime
 import random
+import threading
 import time
 import gi
-from gi.repository import Gtk
+from gi.repository import Gtk, GLib
 from gettext import gettext as _, pgettext as C_
 
 from .constants import icons, icon_loc
 from .frontendUiDrawImageIcon import DrawImage
 from .frontendUiDrawbarLine import DrawBar
 from .config import settings
+from .derivedMetrics import WIND_SPEED
+from .renderStrings import N_, translate, time_label
+from .frameProfiler import timed
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
 icon_loc += "arrow.svg"
 
+NOW = N_("Now")
+
 
 class HourlyDetails(Gtk.Grid):
     def __init__(self, *args, **kwargs):
@@ -27,6 +32,14 @@ class HourlyDetails(Gtk.Grid):
 
         self.set_margin_top(10)
         self.set_margin_start(3)
+
+        # Hours shown per page, more are appended when scrolled to the end
+        self.slot_count = {}
+        # Values the slots of a page are drawn with, per page as pages are
+        # created and extended independently
+        self.page_state = {}
+        self.is_loading_more = False
+        self.nowcast_label = None
         self.paint_ui()
         self.daily_forecast = None
 
@@ -67,6 +80,7 @@ class HourlyDetails(Gtk.Grid):
         tab_box.append(style_buttons_box)
         self.create_stack_page("hourly")
 
+    @timed("hourly_details.switch_page")
     def _on_btn_clicked(self, widget, page_name):
         if self.hourly_stack.get_child_by_name(page_name):
             self.hourly_stack.set_visible_child_name(page_name)
@@ -77,6 +91,9 @@ class HourlyDetails(Gtk.Grid):
     def create_stack_page(self, page_name):
         from .weatherData import hourly_forecast_data as hourly_data
 
+        # Aggregates of today in the location's time, made once per fetch
+        today = max(0, hourly_data.axis.today())
+
         page_grid = Gtk.Grid()
         self.hourly_stack.add_named(page_grid, page_name)
         self.hourly_stack.set_visible_child_name(page_name)
@@ -92,7 +109,7 @@ class HourlyDetails(Gtk.Grid):
         info_grid.attach(desc_label, 0, 0, 1, 2)
 
         val_label = Gtk.Label(
-            label=str(max(hourly_data.windspeed_10m.get("data")[:24])),
+            label=str(hourly_data.windspeed_10m["day_max"][today]),
             halign=Gtk.Align.START,
         )
         val_label.set_css_classes(["text-3", "light-3", "bold-1"])
@@ -103,11 +120,11 @@ class HourlyDetails(Gtk.Grid):
         # Hourly Page
         if page_name == "hourly":
             desc_label.set_text(C_("temperature", "Day Max •"))
-            val_label.set_text(str(max(hourly_data.temperature_2m.get("data")[:24])) + "°")
+            val_label.set_text(str(hourly_data.temperature_2m["day_max"][today]) + "°")
             unit_label.set_text("")
 
         # Precipitation page
-        max_prec = max(hourly_data.precipitation.get("data")[:24])
+        max_prec = hourly_data.precipitation["day_max"][today] or 0
         unit = hourly_data.precipitation.get("unit")
         if settings.is_using_inch_for_prec:
             max_prec = max_prec / 25.4
@@ -118,6 +135,14 @@ class HourlyDetails(Gtk.Grid):
             val_label.set_text(f"{max_prec:.2f}")
             unit_label.set_text(unit)
 
+            # Rain in the next two hours from the 15 minutely nowcast
+            self.nowcast_label = Gtk.Label(
+                hexpand=True, halign=Gtk.Align.END, margin_end=10
+            )
+            self.nowcast_label.set_css_classes(["text-5", "light-3", "bold-2"])
+            info_grid.attach(self.nowcast_label, 4, 0, 1, 2)
+            self.update_nowcast_label()
+
         scrolled_window = Gtk.ScrolledWindow(
             hexpand=True, halign=Gtk.Align.FILL, margin_top=2
         )
@@ -142,7 +167,7 @@ class HourlyDetails(Gtk.Grid):
                 break
 
         if page_name == "prec":
-            total_sum = sum(hourly_data.precipitation.get("data")[:24])
+            total_sum = hourly_data.precipitation["day_sum"][today] or 0
             if total_sum == 0:
                 graphic_box = Gtk.Box(
                     orientation=Gtk.Orientation.VERTICAL,
@@ -172,99 +197,183 @@ class HourlyDetails(Gtk.Grid):
                 graphic_container.append(graphic_box)
                 return
 
+        self.page_state[page_name] = {
+            "max_prec": max_prec,
+            "use_inch_for_prec": settings.is_using_inch_for_prec,
+            "nearest_current_time_idx": nearest_current_time_idx,
+        }
         for i in range(24):
-            graphic_box = Gtk.Box(
-                orientation=Gtk.Orientation.VERTICAL, margin_start=1, margin_end=1 # Reduced margins
+            graphic_container.append(self._create_slot(page_name, i))
+        self.slot_count[page_name] = 24
+
+        # Further hours are added, and loaded if needed, when scrolled to the end
+        scrolled_window.connect(
+            "edge-reached", self._on_edge_reached, page_name, graphic_container
+        )
+
+        # Add scrollbar offset
+        container_size = graphic_container.get_preferred_size()[1]
+        container_width = container_size.width
+        scrollbar_offset = (container_width / 24) * (nearest_current_time_idx - 1)
+        h_adjustment = Gtk.Adjustment(
+            value=scrollbar_offset, lower=0, upper=container_width
+        )
+        scrolled_window.set_hadjustment(h_adjustment)
+
+    # ---------- Nowcast --------------
+    def update_nowcast_label(self):
+        from .weatherData import nowcast_data
+
+        if self.nowcast_label is None:
+            return
+        if nowcast_data is None or len(nowcast_data.precipitation["data"]) == 0:
+            self.nowcast_label.set_visible(False)
+            return
+
+        series = nowcast_data.precipitation["data"]
+        now = time.time()
+        now_idx = max(0, series.index_at(now))
+        rain_idx = series.first_nonzero(now_idx)
+
+        self.nowcast_label.set_visible(True)
+        if rain_idx is None or rain_idx >= now_idx + 8:
+            self.nowcast_label.set_text(_("No rain expected in the next 2 hours"))
+        elif rain_idx == now_idx:
+            self.nowcast_label.set_text(_("Raining now"))
+        else:
+            minutes = int((series.time(rain_idx) - now) // 60)
+            self.nowcast_label.set_text(
+                _("Rain expected in {0} min").format(max(minutes, 1))
             )
-            graphic_box.set_css_classes(["custom_card_hourly", "bg_light_grey"])
 
-            graphic_container.append(graphic_box)
+    # ---------- Single hour of the strip --------------
+    def _create_slot(self, page_name, i):
+        from .weatherData import hourly_forecast_data as hourly_data
+
+        state = self.page_state[page_name]
 
-            label_timestamp = Gtk.Label()
-            label_timestamp.set_css_classes(["text-7", "bold-2", "light-6"])
-            time_stamp = datetime.datetime.fromtimestamp(
-                hourly_data.time.get("data")[i]
+        graphic_box = Gtk.Box(
+            orientation=Gtk.Orientation.VERTICAL, margin_start=1, margin_end=1 # Reduced margins
+        )
+        graphic_box.set_css_classes(["custom_card_hourly", "bg_light_grey"])
+
+        label_timestamp = Gtk.Label()
+        label_timestamp.set_css_classes(["text-7", "bold-2", "light-6"])
+        label_timestamp.set_text(
+            time_label(hourly_data.time.get("data")[i], hourly_data.utc_offset_seconds)
+        )
+
+        if i == state["nearest_current_time_idx"]:
+            label_timestamp.set_text(translate(NOW))
+            label_timestamp.set_css_classes(["bold-1"])
+            graphic_box.set_css_classes(
+                ["custom_card_hourly", "custom_card_hourly_now"]
             )
-            time_label = time_stamp.strftime("%I:%M %p")
-            if settings.is_using_24h_clock:
-                time_label = time_stamp.strftime("%H:%M")
-            label_timestamp.set_text(time_label)
-
-            if i == nearest_current_time_idx:
-                label_timestamp.set_text(_("Now"))
-                label_timestamp.set_css_classes(["bold-1"])
-                graphic_box.set_css_classes(
-                    ["custom_card_hourly", "custom_card_hourly_now"]
-                )
 
-            graphic_box.append(label_timestamp)
+        graphic_box.append(label_timestamp)
+
+        icon_box = Gtk.Box(halign=Gtk.Align.CENTER)
+        graphic_box.append(icon_box)
 
-            icon_box = Gtk.Box(halign=Gtk.Align.CENTER)
-            graphic_box.append(icon_box)
+        label_val = Gtk.Label()
+        label_val.set_css_classes(["text-5", "bold-2", "light-3"])
+        graphic_box.append(label_val)
 
-            label_val = Gtk.Label()
-            label_val.set_css_classes(["text-5", "bold-2", "light-3"])
-            graphic_box.append(label_val)
+        if page_name == "wind":
+            label_val.set_text(str(hourly_data.windspeed_10m.get("data")[i]))
+            label_val.set_margin_top(10)
+            graphic_box.set_tooltip_text(
+                WIND_SPEED.label(hourly_data.windspeed_10m["category"][i])
+            )
+
+            img = DrawImage(
+                icon_loc,
+                hourly_data.wind_direction_10m.get("data")[i] + 180,
+                26,
+                26,
+            )
 
-            if page_name == "wind":
-                label_val.set_text(str(hourly_data.windspeed_10m.get("data")[i]))
-                label_val.set_margin_top(10)
+            icon_box.set_margin_top(10)
+            icon_box.append(img.img_box)
 
-                img = DrawImage(
-                    icon_loc,
-                    hourly_data.wind_direction_10m.get("data")[i] + 180,
-                    26,
-                    26,
-                )
+        elif page_name == "hourly":
+            label_val.set_text(str(hourly_data.temperature_2m.get("data")[i]) + "°")
+            label_timestamp.set_margin_bottom(5)
+
+            weather_code = hourly_data.weathercode.get("data")[i]
+            condition_icon = icons[str(weather_code)]
+
+            # if it is night
+            if hourly_data.is_day.get("data")[i] == 0:
+                condition_icon = icons[str(weather_code) + "n"]
+
+            icon_main = Gtk.Image.new_from_resource(condition_icon)
+            icon_main.set_hexpand(True)
+            icon_main.set_pixel_size(32)
+            icon_box.set_margin_bottom(10)
+            icon_box.append(icon_main)
 
-                icon_box.set_margin_top(10)
-                icon_box.append(img.img_box)
-
-            elif page_name == "hourly":
-                label_val.set_text(str(hourly_data.temperature_2m.get("data")[i]) + "°")
-                label_timestamp.set_margin_bottom(5)
-
-                weather_code = hourly_data.weathercode.get("data")[i]
-                condition_icon = icons[str(weather_code)]
-
-                # if it is night
-                if hourly_data.is_day.get("data")[i] == 0:
-                    condition_icon = icons[str(weather_code) + "n"]
-
-                icon_main = Gtk.Image().new_from_file(condition_icon)
-                icon_main.set_hexpand(True)
-                icon_main.set_pixel_size(32)
-                icon_box.set_margin_bottom(10)
-                icon_box.append(icon_main)
-
-            elif page_name == "prec":
-                bar_obj = None
-                prec = hourly_data.precipitation.get("data")[i]
-                if settings.is_using_inch_for_prec:
-                    prec = hourly_data.precipitation.get("data")[i] / 25.4
-                
-                # Only add the bar if precipitation is greater than 0
-                if prec > 0:
-                    if max_prec == 0: # Avoid division by zero if max_prec is somehow 0
-                        bar_obj = DrawBar(0)
-                    else:
-                        bar_obj = DrawBar(prec / max_prec)
-                    icon_box.append(bar_obj.dw)
-                # Always set the label, even if 0
-                if prec > 0:
-                    label_val.set_text("{:.2f}".format(prec))
-                    if prec < 0.01:
-                        label_val.set_text("{:.1f}+".format(prec))
+        elif page_name == "prec":
+            bar_obj = None
+            prec = hourly_data.precipitation.get("data")[i]
+            if state["use_inch_for_prec"]:
+                prec = prec / 25.4
+
+            # Only add the bar if precipitation is greater than 0
+            if prec > 0:
+                if state["max_prec"] == 0: # Avoid division by zero if max_prec is somehow 0
+                    bar_obj = DrawBar(0)
                 else:
-                    label_val.set_text("0")
+                    # Later days can be wetter than today's high
+                    bar_obj = DrawBar(min(prec / state["max_prec"], 1))
+                icon_box.append(bar_obj.dw)
+            # Always set the label, even if 0
+            if prec > 0:
+                label_val.set_text("{:.2f}".format(prec))
+                if prec < 0.01:
+                    label_val.set_text("{:.1f}+".format(prec))
+            else:
+                label_val.set_text("0")
 
-                label_val.set_margin_top(0)
+            label_val.set_margin_top(0)
 
-        # Add scrollbar offset
-        container_size = graphic_container.get_preferred_size()[1]
-        container_width = container_size.width
-        scrollbar_offset = (container_width / 24) * (nearest_current_time_idx - 1)
-        h_adjustment = Gtk.Adjustment(
-            value=scrollbar_offset, lower=0, upper=container_width
+        return graphic_box
+
+    # ---------- Load more hours at the end of the strip --------------
+    def _on_edge_reached(self, scrolled_window, pos, page_name, graphic_container):
+        if pos != Gtk.PositionType.RIGHT or self.is_loading_more:
+            return
+
+        from .weatherData import hourly_forecast_data as hourly_data
+
+        if self.slot_count[page_name] + 24 <= len(hourly_data.time.get("data")):
+            self._append_slots(page_name, graphic_container)
+            return
+
+        # Next day is not loaded yet, fetch it without blocking the UI
+        self.is_loading_more = True
+        thread = threading.Thread(
+            target=self._load_more_hours,
+            args=(page_name, graphic_container),
+            name="load_hours",
         )
-        scrolled_window.set_hadjustment(h_adjustment)
+        thread.start()
+
+    def _load_more_hours(self, page_name, graphic_container):
+        from .weatherData import extend_hourly_forecast
+
+        try:
+            extend_hourly_forecast()
+        except Exception as e:
+            print(f"Error: {e}")
+        GLib.idle_add(self._append_slots, page_name, graphic_container)
+
+    def _append_slots(self, page_name, graphic_container):
+        from .weatherData import hourly_forecast_data as hourly_data
+
+        self.is_loading_more = False
+        start = self.slot_count[page_name]
+        end = min(start + 24, len(hourly_data.time.get("data")))
+        for i in range(start, end):
+            graphic_container.append(self._create_slot(page_name, i))
+        self.slot_count[page_name] = end
@@ -0,0 +1,58 @@
+import gi
+
+from gi.repository import Gtk
+
+from .frameProfiler import timed
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+
+# Colors of the US AQI categories, Good to Hazardous
+CATEGORY_COLORS = [
+    (0.0, 0.89, 0.0),
+    (1.0, 1.0, 0.0),
+    (1.0, 0.49, 0.0),
+    (1.0, 0.0, 0.0),
+    (0.56, 0.25, 0.59),
+    (0.49, 0.0, 0.14),
+]
+
+
+class AqiChart(Gtk.DrawingArea):
+    """Bar per hour of the air quality index, colored by category."""
+
+    def __init__(self, index, category, now_idx, max_index=300):
+        super().__init__()
+        self.height = 36
+        self.set_hexpand(True)
+        self.set_size_request(-1, self.height)
+
+        # Bar heights and colors are computed once, drawing only paints them
+        self.bars = []
+        for value, cat in zip(index, category):
+            if value is None or cat < 0:
+                self.bars.append(None)
+                continue
+            self.bars.append((min(value / max_index, 1), CATEGORY_COLORS[cat]))
+        self.now_idx = now_idx
+
+        self.set_draw_func(self.on_draw, None)
+
+    @timed("draw.aqi_chart")
+    def on_draw(self, area, ctx, w, h, data):
+        if len(self.bars) == 0:
+            return
+
+        width = self.get_width() - 20
+        slot = width / len(self.bars)
+        bar_width = max(slot - 2, 1)
+
+        for i, bar in enumerate(self.bars):
+            if bar is None:
+                continue
+            level, rgb = bar
+            bar_height = max(level * self.height, 2)
+            alpha = 0.9 if i == self.now_idx else 0.5
+            ctx.set_source_rgba(*rgb, alpha)
+            ctx.rectangle(10 + i * slot, self.height - bar_height, bar_width, bar_height)
+            ctx.fill()
@@ -2,6 +2,8 @@ import gi
 from gi.repository import Gtk
 import cairo
 
+from .frameProfiler import timed
+
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
@@ -28,6 +30,7 @@ class DrawLevelBar:
         self.fill_fr = 1 - fill_fr
         self.rgb = rgb_color  # [r,g,b] (between 0 to 1)
 
+    @timed("draw.bar")
     def draw(self, area, ctx, h, w, data):
         x, y1 = (self.width) / 2, 10
         x, y2 = (self.width) / 2, self.height - 10
@@ -3,18 +3,18 @@ import math
 
 from gi.repository import Gtk
 import cairo
-from datetime import datetime
-from .utils import get_cords, get_time_difference
-from .config import settings
 from gettext import gettext as _, pgettext as C_
 
+from .frameProfiler import timed
+
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
 
 class DrawDayNight:
-    def __init__(self, angle, width, height):
+    def __init__(self, angle, width, height, clock_text=""):
         self.angle_degrees = angle  # Specify the rotation angle in degrees
+        self.clock_text = clock_text  # Time in the location
         self.width = width
         self.height = height
 
@@ -26,6 +26,14 @@ class DrawDayNight:
         self.img_box = Gtk.Box()
         self.img_box.append(self.drawing_area)
 
+    def set_position(self, angle, clock_text):
+        if angle == self.angle_degrees and clock_text == self.clock_text:
+            return
+        self.angle_degrees = angle
+        self.clock_text = clock_text
+        self.drawing_area.queue_draw()
+
+    @timed("draw.day_night")
     def on_draw(self, widget, cr, width, height, data):
         # Create a Cairo surface
         context = cr
@@ -70,22 +78,13 @@ class DrawDayNight:
         )
         context.set_font_size(13)
         context.set_source_rgba(0.7, 0.7, 0.7, 1.0)  # Black
-        t_data = get_time_difference(*get_cords())
-        target_time = t_data.get("target_time")
-
-        # Calculate the position for text placement
+        # Calculate the position for text placement, 24h times are shorter
+        text = self.clock_text
         text_x = center_x - 30
         text_y = center_y + 15
-
-        date_time = datetime.fromtimestamp(target_time)
-        formatted_date_time = date_time.strftime("%I:%M %p")
-
-        if settings.is_using_24h_clock:
-            formatted_date_time = date_time.strftime("%H:%M")
+        if len(text) <= 5:
             text_x += 7
 
-        text = formatted_date_time
-
         # Move the text cursor to the calculated position
         context.move_to(text_x, text_y)
 
@@ -2,10 +2,27 @@ import gi
 import math
 from gi.repository import Gtk, Gdk, GdkPixbuf
 
+from .frameProfiler import timed
+
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
 
+# Icons rendered at a size, shared by every DrawImage
+_pixbufs = {}
+
+
+def _load_pixbuf(path, width, height):
+    # path is a resource path, the svg is rendered once per size
+    key = (path, width, height)
+    pixbuf = _pixbufs.get(key)
+    if pixbuf is None:
+        pixbuf = _pixbufs[key] = GdkPixbuf.Pixbuf.new_from_resource_at_scale(
+            path, width, height, False
+        )
+    return pixbuf
+
+
 class DrawImage:
     def __init__(self, path, angle, width, height):
         self.image_path = path  # Replace with the path to your image file
@@ -21,15 +38,14 @@ class DrawImage:
         self.img_box = Gtk.Box()
         self.img_box.append(self.drawing_area)
 
+    @timed("draw.image_icon")
     def on_draw(self, widget, cr, width, height, data):
         # Clear the drawing area
         cr.set_source_rgba(0, 1, 1, 0)
         cr.rectangle(0, 0, width, height)
         cr.fill()
 
-        # Load the image
-        pixbuf = GdkPixbuf.Pixbuf.new_from_file(self.image_path)
-        pixbuf = pixbuf.scale_simple(self.width, self.height, GdkPixbuf.InterpType(2))
+        pixbuf = _load_pixbuf(self.image_path, self.width, self.height)
 
         # Calculate the rotation point
         rotation_x = (width - width * 0.1) / 2
@@ -2,6 +2,8 @@ import gi
 import cairo 
 from gi.repository import Gtk
 
+from .frameProfiler import timed
+
 gi.require_version('Gtk', '4.0')
 gi.require_version('Adw', '1')
 
@@ -15,6 +17,7 @@ class PollutionBar(Gtk.DrawingArea):
         self.set_draw_func(self.on_draw,None)
         self.set_size_request(width,height)
 
+    @timed("draw.pollution_bar")
     def on_draw(self, area, cr, h, w, data):
         width = self.get_width()
         height = 40
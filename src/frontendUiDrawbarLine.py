@@ -3,6 +3,8 @@ import gi
 from gi.repository import Gtk
 import cairo
 
+from .frameProfiler import timed
+
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
@@ -17,6 +19,7 @@ class DrawBar:
         self.value = self.ht*value
         self.rgb = rgb_color
 
+    @timed("draw.bar_line")
     def draw(self, area, ctx, h, w, data):
 
         if self.value == 0:
@@ -0,0 +1,10 @@
+import gi
+
+gi.require_version("Adw", "1")
+from gi.repository import Adw
+
+
+def create_toast(text, priority=0):
+    toast = Adw.Toast.new(text)
+    toast.set_priority(Adw.ToastPriority(priority))
+    return toast
@@ -0,0 +1,188 @@
+import os
+import time
+import sqlite3
+import threading
+
+from .tracing import span
+
+# Observed conditions are stored in an SQLite database. Values are quantized
+# to integers (SQLite stores small integers in 1-4 bytes) and timestamps are
+# stored in minutes relative to EPOCH_BASE so they fit in 3 bytes. Rows are
+# not delta encoded against the previous one, (loc, ts) is the primary key
+# and range queries need the absolute time of every row.
+#
+# Recording is opt-in, nothing is stored until "record-history" is turned on
+# in preferences.
+EPOCH_BASE = 1704067200  # 2024-01-01 00:00 UTC
+
+# field: scale, value stored = round(value * scale)
+CURRENT_FIELDS = {
+    "temperature_2m": 10,
+    "apparent_temperature": 10,
+    "relativehumidity_2m": 1,
+    "surface_pressure": 10,
+    "windspeed_10m": 10,
+    "winddirection_10m": 1,
+    "precipitation": 100,
+    "weathercode": 1,
+    "is_day": 1,
+}
+
+AIR_POLLUTION_FIELDS = {
+    "us_aqi": 1,
+    "european_aqi": 1,
+    "pm2_5": 10,
+    "pm10": 10,
+    "carbon_monoxide": 1,
+    "nitrogen_dioxide": 10,
+    "sulphur_dioxide": 10,
+    "ozone": 10,
+}
+
+# Coordinates are quantized to ~100 m so a location has a stable id
+COORD_SCALE = 1000
+
+# Snapshots older than this are deleted
+RETENTION = 365 * 24 * 60 * 60
+
+
+def _data_dir():
+    base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "mousam")
+
+
+def _encode_ts(ts):
+    return (int(ts) - EPOCH_BASE) // 60
+
+
+def _decode_ts(minutes):
+    return EPOCH_BASE + minutes * 60
+
+
+def _location_id(lat, lon):
+    # Both coordinates packed in one integer, usable as primary key prefix
+    lat_q = round(float(lat) * COORD_SCALE) + 90 * COORD_SCALE
+    lon_q = round(float(lon) * COORD_SCALE) + 180 * COORD_SCALE
+    return lat_q * (360 * COORD_SCALE + 1) + lon_q
+
+
+class HistoryStore:
+    """Local time series of observed conditions per location."""
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(_data_dir(), exist_ok=True)
+            path = os.path.join(_data_dir(), "history.db")
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        # WITHOUT ROWID tables are clustered on (loc, ts), so a range query
+        # for a location reads consecutive pages
+        current_cols = ", ".join(f"{f} INTEGER" for f in CURRENT_FIELDS)
+        air_cols = ", ".join(f"{f} INTEGER" for f in AIR_POLLUTION_FIELDS)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS current (loc INTEGER, ts INTEGER, "
+                f"{current_cols}, PRIMARY KEY (loc, ts)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS air_pollution (loc INTEGER, ts INTEGER, "
+                f"{air_cols}, PRIMARY KEY (loc, ts)) WITHOUT ROWID"
+            )
+
+    # ============ Writing ============
+    def _insert(self, table, fields, lat, lon, snapshots):
+        # snapshots: list of (ts, {field: value})
+        loc = _location_id(lat, lon)
+        rows = []
+        for ts, values in snapshots:
+            row = [loc, _encode_ts(ts)]
+            for field, scale in fields.items():
+                value = values.get(field)
+                row.append(None if value is None else round(value * scale))
+            rows.append(row)
+
+        columns = ", ".join(["loc", "ts", *fields])
+        placeholders = ", ".join("?" * (len(fields) + 2))
+        with span(f"history.insert.{table}", cat="storage"), self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+                rows,
+            )
+
+    def record_current(self, lat, lon, current_weather):
+        """Store a CurrentWeather snapshot, one row per observation time."""
+        values = {}
+        for field in CURRENT_FIELDS:
+            if current_weather.has(field):
+                values[field] = getattr(current_weather, field).get("data")
+        ts = current_weather.time.get("data")
+        self._insert("current", CURRENT_FIELDS, lat, lon, [(ts, values)])
+
+    def record_air_pollution(self, lat, lon, snapshots):
+        """Store hourly air quality values, a list of (ts, {field: value})."""
+        self._insert("air_pollution", AIR_POLLUTION_FIELDS, lat, lon, snapshots)
+
+    def prune(self, max_age=RETENTION):
+        cutoff = _encode_ts(time.time() - max_age)
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM current WHERE ts < ?", (cutoff,))
+            self.conn.execute("DELETE FROM air_pollution WHERE ts < ?", (cutoff,))
+
+    # ============ Reading ============
+    def _query(self, table, fields, lat, lon, start, end, wanted):
+        wanted = list(wanted or fields)
+        columns = ", ".join(["ts", *wanted])
+        with span(f"history.query.{table}", cat="storage"), self.lock:
+            rows = self.conn.execute(
+                f"SELECT {columns} FROM {table} WHERE loc = ? AND ts BETWEEN ? AND ? "
+                "ORDER BY ts",
+                (_location_id(lat, lon), _encode_ts(start), _encode_ts(end)),
+            ).fetchall()
+
+        # Columnar result: {"time": [...], field: [...]}
+        result = {"time": [_decode_ts(row[0]) for row in rows]}
+        for i, field in enumerate(wanted, start=1):
+            scale = fields[field]
+            if scale == 1:
+                result[field] = [row[i] for row in rows]
+            else:
+                result[field] = [
+                    None if row[i] is None else row[i] / scale for row in rows
+                ]
+        return result
+
+    def query_current(self, lat, lon, start, end, fields=None):
+        """Observed conditions of a location between start and end (unix time)."""
+        return self._query("current", CURRENT_FIELDS, lat, lon, start, end, fields)
+
+    def query_air_pollution(self, lat, lon, start, end, fields=None):
+        return self._query(
+            "air_pollution", AIR_POLLUTION_FIELDS, lat, lon, start, end, fields
+        )
+
+    def nearest_current(self, lat, lon, ts, tolerance=60 * 60):
+        """Snapshot closest to ts within tolerance, e.g. for "vs. yesterday"."""
+        data = self.query_current(lat, lon, ts - tolerance, ts + tolerance)
+        if len(data["time"]) == 0:
+            return None
+
+        idx = min(range(len(data["time"])), key=lambda i: abs(data["time"][i] - ts))
+        return {field: values[idx] for field, values in data.items()}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_history_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+            _store.prune()
+    return _store
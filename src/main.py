@@ -17,7 +17,6 @@
 #
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-import os
 import sys
 import gi
 from .mousam import WeatherMainWindow
@@ -27,6 +26,8 @@ gi.require_version('Adw', '1')
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk, Gio, Adw, Gdk
 
+css_provider = None
+
 
 class WeatherApplication(Adw.Application):
     """The main application singleton class."""
@@ -44,14 +45,16 @@ class WeatherApplication(Adw.Application):
     def do_activate(self):
         win = self.props.active_window
         global css_provider
-        CSS_PATH = os.path.dirname(os.path.realpath(__file__)) + "/css/"
-        css_provider = Gtk.CssProvider()
-        Priority = Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
-        with open(CSS_PATH+'style.css', 'r') as css_file:
-            css = bytes(css_file.read(), 'utf-8')
-        css_provider.load_from_data(css,len(css))
-        Gtk.StyleContext.add_provider_for_display(Gdk.Display.get_default(), css_provider, Priority)
-
+        # activate runs again for every launch while the app is running,
+        # the stylesheet is parsed and added to the display only once
+        if css_provider is None:
+            css_provider = Gtk.CssProvider()
+            css_provider.load_from_resource("/io/github/amit9838/mousam/css/style.css")
+            Gtk.StyleContext.add_provider_for_display(
+                Gdk.Display.get_default(),
+                css_provider,
+                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
+            )
 
         if not win:
             win = WeatherMainWindow(application=self)
@@ -6,12 +6,14 @@ from gettext import gettext as _, pgettext as C_
 
 
 # module import
-from .utils import create_toast, check_internet_connection, get_time_difference
+from .utils import check_internet_connection
+from .frontendUtils import create_toast
 from .constants import bg_css
 from .windowAbout import AboutWindow
 from .windowPreferences import WeatherPreferences
 from .shortcutsDialog import ShortcutsDialog
 from .windowLocations import WeatherLocations
+from .windowOverview import WeatherOverview
 from .frontendCurrentCond import CurrentCondition
 from .frontendHourlyDetails import HourlyDetails
 from .frontendForecast import Forecast
@@ -19,17 +21,27 @@ from .frontendCardSquare import CardSquare
 from .frontendCardDayNight import CardDayNight
 from .frontendCardAirPollution import CardAirPollution
 from .config import settings
+from .backendTransport import expire_cache
+from .refreshScheduler import RefreshScheduler
+from .tracing import span, traced
+from . import frameProfiler
+from . import fieldRegistry
 from .weatherData import (
     fetch_current_weather,
     fetch_hourly_forecast,
     fetch_daily_forecast,
     fetch_current_air_pollution,
+    fetch_nowcast,
 )
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Gtk, Adw, Gio, Gdk, GLib
 
+# Window width (px) below which the forecast is stacked above the cards
+NARROW_WIDTH = 450
+LAYOUT_HYSTERESIS = 10
+
 global updated_at
 updated_at = time.time()
 
@@ -80,6 +92,12 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         self.location_button.set_icon_name("find-location-symbolic")
         self.location_button.connect("clicked", self._on_locations_clicked)
 
+        # Add overview option
+        action = Gio.SimpleAction.new("overview", None)
+        action.connect("activate", self._on_overview_clicked)
+        self.add_action(action)
+        menu.append(_("Overview"), "win.overview")
+
         # Add preferences option
         action = Gio.SimpleAction.new("preferences", None)
         action.connect("activate", self._on_preferences_clicked)
@@ -111,6 +129,9 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         self.scrolled_window.set_kinetic_scrolling(True)
         self.toast_overlay.set_child(self.scrolled_window)
 
+        # Frame times overlay, only with MOUSAM_FRAMES set
+        frameProfiler.attach(self, self.toast_overlay)
+
         # Content Box - main vertical container for all content
         self.content_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         self.content_box.set_vexpand(True)
@@ -126,21 +147,37 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         self.main_stack.set_transition_duration(duration=100)
         self.clamp.set_child(self.main_stack)
 
+        # Loads requested while one is running are merged into one reload
+        self._load_state_lock = threading.Lock()
+        self._is_loading = False
+        self._reload_pending = False
+        # Set once the first load is done, the scheduler waits for it
+        self.has_loaded = False
+
+        # Fields only the history store reads are requested while recording
+        fieldRegistry.set_active("history", settings.is_recording_history)
+
         # Start Loader and call paint UI
         # Initiate UI loading weather data and drawing UI
         thread = threading.Thread(target=self._load_weather_data, name="load_data")
         thread.start()
 
+        # Refresh stale data in background
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.refresh_scheduler.start()
+
         # Set key listeners
         keycont = Gtk.EventControllerKey()
         keycont.connect("key-pressed", self.on_key_press)
         self.add_controller(keycont)
 
-        # Observe window default width/height changes to handle responsive layout
+        # Observe window width changes to handle responsive layout
         self.connect("notify::default-width", self._on_window_resize)
-        self.connect("notify::default-height", self._on_window_resize)
+        self._layout_tick_id = None
+        self._narrow_layout = None
 
         # Hold references to dynamic containers (will be set later)
+        self.hourly_details_ref = None
         self.detail_forecast_box = None
         self.card_flow_ref = None
         self.forecast_box_ref = None
@@ -216,15 +253,15 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         # Loader container
         message = _("No Internet")
         icon = "network-error-symbolic"
-        desc = ""
         if type == "api_error":
             message = _("Could not fetch data from API")
-            desc = desc
             icon = "computer-fail-symbolic"
 
         child = self.main_stack.get_child_by_name("error_box")
         self.toast_overlay.add_toast(create_toast(message, 1))
         if child is not None:
+            self.error_label.set_label(message)
+            self.error_desc.set_label(desc)
             self.main_stack.set_visible_child_name("error_box")
             return
 
@@ -251,6 +288,47 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
 
     # =========== Load Weather data using threads =============
     def _load_weather_data(self):
+        self._run_load(self._fetch_weather_data)
+
+    def run_background_load(self, load):
+        """Run load() in the calling thread unless a load is running.
+
+        Used by the refresh scheduler, so background refreshes and the
+        loads started by the user never run at the same time. Returns
+        False when skipped, the running load fetches fresh data anyway.
+        """
+        return self._run_load(load, queue=False)
+
+    def _run_load(self, load, queue=True):
+        # Switching city, changing unit and refreshing can all start a load
+        # at the same time. Only one runs, the others ask it to load once
+        # more when done as the selected city or unit may have changed.
+        with self._load_state_lock:
+            if self._is_loading:
+                if queue:
+                    self._reload_pending = True
+                return False
+            self._is_loading = True
+
+        try:
+            while True:
+                load()
+                with self._load_state_lock:
+                    self.has_loaded = True
+                    if not self._reload_pending:
+                        self._is_loading = False
+                        return True
+                    self._reload_pending = False
+                load = self._fetch_weather_data
+        except BaseException:
+            # A failed load must not leave every later one waiting for it
+            with self._load_state_lock:
+                self._is_loading = False
+                self._reload_pending = False
+            raise
+
+    @traced("load_weather_data")
+    def _fetch_weather_data(self):
         has_internet = check_internet_connection()
         if not has_internet:
             self.show_error()
@@ -262,34 +340,60 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
 
         self.show_loader()
 
+        # Errors raised in fetch threads, retries have already been done by
+        # the transport so they are shown to the user straight away
+        errors = []
+
+        def run(fetch, *args):
+            # Any error, a malformed response fails in the models, shows the
+            # error page instead of building the UI from missing data
+            try:
+                fetch(*args)
+            except Exception as e:
+                errors.append(e)
+
         # cwd : current_weather_data
         # cwt : current_weather_thread
-        cwd = threading.Thread(target=fetch_current_weather, name="cwt")
+        cwd = threading.Thread(target=run, args=(fetch_current_weather,), name="cwt")
         cwd.start()
         cwd.join()
+        if errors:
+            GLib.idle_add(self.show_error, "api_error", str(errors[0]))
+            return
 
-        hfd = threading.Thread(target=fetch_hourly_forecast, name="hft")
+        hfd = threading.Thread(target=run, args=(fetch_hourly_forecast,), name="hft")
         hfd.start()
 
-        dfd = threading.Thread(target=fetch_daily_forecast, name="dft")
+        dfd = threading.Thread(target=run, args=(fetch_daily_forecast,), name="dft")
         dfd.start()
 
-        apd = threading.Thread(target=fetch_current_air_pollution, name="apt")
+        apd = threading.Thread(
+            target=run, args=(fetch_current_air_pollution,), name="apt"
+        )
         apd.start()
 
-        lat, lon = settings.selected_city.split(",")
-        local_time = threading.Thread(
-            target=get_time_difference, args=(lat, lon, True), name="local_time"
-        )
-        local_time.start()
+        # Nowcast is optional, the UI is built without it when it fails
+        def run_optional(fetch):
+            try:
+                fetch()
+            except Exception as e:
+                print(f"Error: {e}")
+
+        ncd = threading.Thread(target=run_optional, args=(fetch_nowcast,), name="nct")
+        ncd.start()
 
         hfd.join()
         dfd.join()
         apd.join()
-        local_time.join()
+        ncd.join()
+        if errors:
+            GLib.idle_add(self.show_error, "api_error", str(errors[0]))
+            return
+
         self.get_weather()
 
     # ===========  Load weather data and create UI ============
+    @traced("get_weather", cat="render")
     def get_weather(self, reload_type=None, title=""):
         from .weatherData import current_weather_data as cw_data
 
@@ -310,7 +414,8 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         current_condition_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         current_condition_box.set_margin_bottom(10)
         current_container_clamp = Adw.Clamp(maximum_size=1400, tightening_threshold=200)
-        current_container_clamp.set_child(CurrentCondition())
+        with span("render.current_condition", cat="render"):
+            current_container_clamp.set_child(CurrentCondition())
         current_condition_box.append(current_container_clamp)
         content_box.append(current_condition_box)
         
@@ -320,7 +425,8 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         # Create a box for hourly details
         hourly_details_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
         hourly_details_box.set_margin_bottom(10)
-        hourly_details = HourlyDetails()
+        with span("render.hourly_details", cat="render"):
+            hourly_details = HourlyDetails()
         hourly_details_box.append(hourly_details)
         main_container.append(hourly_details_box)
         
@@ -341,7 +447,8 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         
         # Create a box for forecast
         forecast_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
-        forecast = Forecast()
+        with span("render.forecast", cat="render"):
+            forecast = Forecast()
         forecast_box.append(forecast)
         
         # Add both components side by side in wide layout
@@ -404,11 +511,13 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         card_flow.append(card_obj.card)
 
         # -------- Card Pollution ---------
-        card_obj = CardAirPollution()
+        with span("render.card_air_pollution", cat="render"):
+            card_obj = CardAirPollution()
         card_flow.append(card_obj.card)
 
         # -------- Card Day/Night --------
-        card_obj = CardDayNight()
+        with span("render.card_day_night", cat="render"):
+            card_obj = CardDayNight()
         card_flow.append(card_obj.card)
 
         # Add the content to the main stack
@@ -416,11 +525,16 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         self.main_stack.set_visible_child_name("main_content")
 
         # Save references for responsive behaviour
+        self.hourly_details_ref = hourly_details
         self.detail_forecast_box = detail_forecast_box
         self.card_flow_ref = card_flow
         self.forecast_box_ref = forecast_box
         self.card_box_ref = card_box
 
+        # New boxes are built side by side, lay them out for the current width
+        self._narrow_layout = None
+        self._apply_layout()
+
         if reload_type == "switch":
             self.toast_overlay.add_toast(
                 create_toast(_("Switched to {}".format(title)), 1)
@@ -428,6 +542,10 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         elif reload_type == "refresh":
             self.toast_overlay.add_toast(create_toast(_("Refreshed Successfully"), 1))
 
+    def update_nowcast(self):
+        if self.hourly_details_ref is not None:
+            self.hourly_details_ref.update_nowcast_label()
+
     # ============= Refresh buttom methods ==============
     def _refresh_weather(self, widget=None):
         global updated_at
@@ -446,6 +564,8 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         else:
             updated_at = time.time()
             self.toast_overlay.add_toast(create_toast(_("Refreshing..."), 1))
+            # Ask the api again even for responses still within their ttl
+            expire_cache()
             thread = threading.Thread(target=self._load_weather_data, name="load_data")
             thread.start()
 
@@ -473,6 +593,12 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
         adw_preferences_window = WeatherLocations(self.main_window)
         adw_preferences_window.show()
 
+    def _on_overview_clicked(self, *args, **kwargs):
+        if len(self.added_cities) == 0:
+            return
+        overview_window = WeatherOverview(self.main_window)
+        overview_window.show()
+
     def _show_shortcuts_dialog(self, *args, **kwargs):
         dialog = ShortcutsDialog(self)
         dialog.show()
@@ -497,37 +623,45 @@ class WeatherMainWindow(Gtk.ApplicationWindow):
 
     # ------------ Responsive layout handler -------------
     def _on_window_resize(self, *args):
-        """Adjust layouts whenever window size properties change."""
+        """Update the layout on the next frame, at most once per frame."""
+        if self._layout_tick_id is None:
+            self._layout_tick_id = self.add_tick_callback(self._on_layout_tick)
+
+    def _on_layout_tick(self, widget, frame_clock):
+        self._layout_tick_id = None
+        self._apply_layout()
+        return GLib.SOURCE_REMOVE
+
+    @frameProfiler.timed("window.layout")
+    def _apply_layout(self):
+        """Stack the forecast above the cards on narrow windows."""
         # Ensure UI elements are created
         if not self.detail_forecast_box:
             return
 
-        # Get current window size
-        width, _ = self.get_default_size()
-
-        # When the window is narrow, stack vertically with forecast first.
-        if width < 450:
-            # Switch to vertical stacking
-            if self.detail_forecast_box.get_orientation() != Gtk.Orientation.VERTICAL:
-                self.detail_forecast_box.set_orientation(Gtk.Orientation.VERTICAL)
-                # Re-order children: forecast on top, cards below
-                self.detail_forecast_box.remove(self.card_box_ref)
-                self.detail_forecast_box.remove(self.forecast_box_ref)
-                self.detail_forecast_box.append(self.forecast_box_ref)
-                self.detail_forecast_box.append(self.card_box_ref)
-
-            # Make cards single column
+        # The layout flips only once the width is LAYOUT_HYSTERESIS past
+        # the breakpoint, so dragging around it does not flip it back and forth
+        width = self.get_default_size()[0]
+        if self._narrow_layout is None:
+            narrow = width < NARROW_WIDTH
+        elif self._narrow_layout:
+            narrow = width < NARROW_WIDTH + LAYOUT_HYSTERESIS
+        else:
+            narrow = width < NARROW_WIDTH - LAYOUT_HYSTERESIS
+        if narrow == self._narrow_layout:
+            return
+        self._narrow_layout = narrow
+
+        # Children are reordered in place, removing them would unrealize them
+        if narrow:
+            # Forecast on top, cards below in a single column
+            self.detail_forecast_box.set_orientation(Gtk.Orientation.VERTICAL)
+            self.detail_forecast_box.reorder_child_after(self.forecast_box_ref, None)
             if self.card_flow_ref:
                 self.card_flow_ref.set_max_children_per_line(1)
         else:
-            # Horizontal side-by-side layout
-            if self.detail_forecast_box.get_orientation() != Gtk.Orientation.HORIZONTAL:
-                self.detail_forecast_box.set_orientation(Gtk.Orientation.HORIZONTAL)
-                # Ensure order: cards first, forecast second
-                self.detail_forecast_box.remove(self.card_box_ref)
-                self.detail_forecast_box.remove(self.forecast_box_ref)
-                self.detail_forecast_box.append(self.card_box_ref)
-                self.detail_forecast_box.append(self.forecast_box_ref)
-
+            # Cards and forecast side by side
+            self.detail_forecast_box.set_orientation(Gtk.Orientation.HORIZONTAL)
+            self.detail_forecast_box.reorder_child_after(self.card_box_ref, None)
             if self.card_flow_ref:
                 self.card_flow_ref.set_max_children_per_line(3)
@@ -0,0 +1,179 @@
+import time
+import random
+import threading
+import gi
+
+from .config import settings
+from .tracing import span
+from . import weatherData
+from .weatherData import (
+    fetch_current_weather,
+    fetch_hourly_forecast,
+    fetch_daily_forecast,
+    fetch_current_air_pollution,
+    fetch_overview,
+    fetch_nowcast,
+)
+
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gdk, Gio, GLib
+
+# Seconds after which a dataset is stale, roughly the update cadence of the
+# underlying Open-Meteo models
+DATASET_TTL = {
+    "nowcast": 5 * 60,
+    "current": 15 * 60,
+    "hourly": 60 * 60,
+    "air_pollution": 60 * 60,
+    "daily": 3 * 60 * 60,
+}
+
+# Order in which stale datasets are fetched
+DATASET_FETCHERS = [
+    ("current", fetch_current_weather),
+    ("hourly", fetch_hourly_forecast),
+    ("daily", fetch_daily_forecast),
+    ("air_pollution", fetch_current_air_pollution),
+    ("nowcast", fetch_nowcast),
+]
+
+TICK_INTERVAL = 60  # seconds between staleness checks
+JITTER = 0.1  # +-10% of the ttl, spreads refreshes of many clients
+MIN_BACKOFF = 60
+MAX_BACKOFF = 60 * 60
+
+
+class RefreshScheduler:
+    """Refresh stale weather data in background.
+
+    Every minute the datasets of the selected city whose ttl has expired
+    are fetched again and the UI is rebuilt. When enabled in preferences,
+    the stale ones of the other added cities are refreshed as well, all in
+    one request. Nothing is fetched while the window is minimized or the
+    network is metered, failures back off exponentially and focusing the
+    window refreshes stale data at once.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.failures = 0
+        self.retry_at = 0
+        self._ttl_factor = {name: self._jitter() for name in DATASET_TTL}
+        self._source_id = None
+
+    def start(self):
+        if self._source_id is None:
+            self._source_id = GLib.timeout_add_seconds(TICK_INTERVAL, self._on_tick)
+            self.window.connect("notify::is-active", self._on_focus_changed)
+
+    def stop(self):
+        if self._source_id is not None:
+            GLib.source_remove(self._source_id)
+            self._source_id = None
+
+    # ============ Staleness ============
+    @staticmethod
+    def _jitter():
+        return random.uniform(1 - JITTER, 1 + JITTER)
+
+    def stale_datasets(self):
+        now = time.time()
+        stale = []
+        for name, _fetch in DATASET_FETCHERS:
+            fetched_at = weatherData.last_fetched.get(name, 0)
+            if now - fetched_at >= DATASET_TTL[name] * self._ttl_factor[name]:
+                stale.append(name)
+        return stale
+
+    def _stale_cities(self):
+        # All of them are fetched in one batched request
+        cities = [
+            tuple(float(x) for x in city.split(",")[-2:])
+            for city in self.window.added_cities
+        ]
+        selected = tuple(settings.selected_cords)
+        now = time.time()
+        stale = []
+        for city in cities:
+            if city == selected:
+                continue
+            snapshot = weatherData.city_snapshots.get(weatherData.snapshot_key(city))
+            if snapshot is None or now - snapshot["fetched_at"] >= DATASET_TTL["current"]:
+                stale.append(city)
+        return stale
+
+    # ============ Pausing ============
+    def _is_window_hidden(self):
+        if not self.window.is_visible():
+            return True
+        surface = self.window.get_surface()
+        if surface is None:
+            return True
+        hidden_states = Gdk.ToplevelState.MINIMIZED
+        if hasattr(Gdk.ToplevelState, "SUSPENDED"):
+            hidden_states |= Gdk.ToplevelState.SUSPENDED
+        return bool(surface.get_state() & hidden_states)
+
+    def _is_network_metered(self):
+        return Gio.NetworkMonitor.get_default().get_network_metered()
+
+    # ============ Callbacks ============
+    def _on_tick(self):
+        if self._is_window_hidden() or self._is_network_metered():
+            return GLib.SOURCE_CONTINUE
+        self.refresh_if_stale()
+        return GLib.SOURCE_CONTINUE
+
+    def _on_focus_changed(self, window, pspec):
+        # Data shown to the user should always be fresh, even on metered
+        # networks, so the focus refresh does not check metering
+        if window.is_active():
+            self.refresh_if_stale()
+
+    def refresh_if_stale(self):
+        # Until the first load is done nothing has been fetched yet and
+        # every dataset would look stale
+        if not self.window.has_loaded:
+            return
+        if len(self.window.added_cities) == 0 or time.time() < self.retry_at:
+            return
+
+        datasets = self.stale_datasets()
+        cities = []
+        if settings.should_refresh_all_cities:
+            cities = self._stale_cities()
+
+        if datasets or cities:
+            # Runs as a load of the window, skipped while another one runs
+            thread = threading.Thread(
+                target=self.window.run_background_load,
+                args=(lambda: self._refresh(datasets, cities),),
+                name="bg_refresh",
+            )
+            thread.start()
+
+    # ============ Worker ============
+    def _refresh(self, datasets, cities):
+        try:
+            with span("background_refresh", datasets=",".join(datasets)):
+                for name, fetch in DATASET_FETCHERS:
+                    if name in datasets:
+                        fetch()
+                        self._ttl_factor[name] = self._jitter()
+                if cities:
+                    fetch_overview(cities, max_age=DATASET_TTL["current"])
+        except Exception as e:
+            self.failures += 1
+            backoff = min(MAX_BACKOFF, MIN_BACKOFF * 2 ** (self.failures - 1))
+            self.retry_at = time.time() + backoff * self._jitter()
+            print(f"Background refresh failed, retrying in {backoff}s: {e}")
+            return
+
+        self.failures = 0
+        self.retry_at = 0
+        # The nowcast changes every few minutes, update its label in place
+        # instead of rebuilding the whole UI
+        if any(name != "nowcast" for name in datasets):
+            GLib.idle_add(self.window.get_weather)
+        elif datasets:
+            GLib.idle_add(self.window.update_nowcast)
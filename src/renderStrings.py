@@ -0,0 +1,108 @@
+import locale
+from datetime import datetime, timedelta, timezone
+from gettext import gettext as _, pgettext as C_
+
+from .config import settings
+
+# Strings needed while building the UI (translated labels, hour and day
+# names of time steps) are made once per locale and then looked up.
+
+# Time labels kept per table before it is cleared, ~ a few weeks of hours
+MAX_TIME_LABELS = 4096
+
+
+def N_(msgid):
+    # Marks a label for translation, translated when first used
+    return (None, msgid)
+
+
+def NC_(context, msgid):
+    return (context, msgid)
+
+
+def current_locale():
+    try:
+        return locale.getlocale(locale.LC_MESSAGES)
+    except (AttributeError, ValueError):
+        return None
+
+
+_translated = {}
+
+
+def translate(label):
+    """Translated text of a label made with N_() or NC_()."""
+    key = (current_locale(), label)
+    text = _translated.get(key)
+    if text is None:
+        context, msgid = label
+        text = _(msgid) if context is None else C_(context, msgid)
+        _translated[key] = text
+    return text
+
+
+def translate_all(labels):
+    key = (current_locale(), labels)
+    texts = _translated.get(key)
+    if texts is None:
+        texts = _translated[key] = tuple(translate(label) for label in labels)
+    return texts
+
+
+# ============ Time labels ============
+_time_tables = {}
+
+
+def _table(kind, fmt):
+    key = (current_locale(), kind, fmt)
+    table = _time_tables.get(key)
+    if table is None or len(table) > MAX_TIME_LABELS:
+        table = _time_tables[key] = {}
+    return table
+
+
+def _clock_format():
+    return "%H:%M" if settings.is_using_24h_clock else "%I:%M %p"
+
+
+def _local_format(ts, fmt, utc_offset):
+    tz = None if utc_offset is None else timezone(timedelta(seconds=utc_offset))
+    return datetime.fromtimestamp(ts, tz).strftime(fmt)
+
+
+def time_label(ts, utc_offset=None):
+    """Clock time of a unix timestamp, 12h or 24h as set in preferences.
+
+    In the time utc_offset seconds from GMT if given, else in system time.
+    """
+    fmt = _clock_format()
+    table = _table("time", fmt)
+    key = (ts, utc_offset)
+    label = table.get(key)
+    if label is None:
+        label = table[key] = _local_format(ts, fmt, utc_offset)
+    return label
+
+
+def time_labels(series, utc_offset=None):
+    """Clock times of a whole series of timestamps, see time_label()."""
+    fmt = _clock_format()
+    table = _table("time", fmt)
+    labels = []
+    for ts in series:
+        key = (ts, utc_offset)
+        label = table.get(key)
+        if label is None:
+            label = table[key] = _local_format(ts, fmt, utc_offset)
+        labels.append(label)
+    return labels
+
+
+def weekday_label(ts, utc_offset=None):
+    """Day name of ts, in the time utc_offset seconds from GMT if given."""
+    table = _table("weekday", "%A")
+    key = (ts, utc_offset)
+    label = table.get(key)
+    if label is None:
+        label = table[key] = _local_format(ts, "%A", utc_offset)
+    return label
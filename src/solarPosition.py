@@ -0,0 +1,120 @@
+import math
+
+# Position of the sun from the NOAA solar calculator equations
+# (https://gml.noaa.gov/grad/solcalc/calcdetails.html), accurate to about a
+# minute for sunrise and sunset between 1900 and 2100. Everything works on
+# unix timestamps, nothing is fetched, and a series of days or cities
+# costs a few trig calls per item.
+
+SECONDS_PER_DAY = 86400
+
+# Zenith of the sun's center at sunrise and sunset, 90° plus refraction
+# and the sun's radius
+SUNRISE_ZENITH = 90.833
+
+
+def _julian_century(ts):
+    julian_day = ts / SECONDS_PER_DAY + 2440587.5
+    return (julian_day - 2451545.0) / 36525.0
+
+
+def _sun_terms(ts):
+    """Declination (radians) and equation of time (minutes) at ts."""
+    t = _julian_century(ts)
+
+    mean_long = math.radians((280.46646 + t * (36000.76983 + t * 0.0003032)) % 360)
+    mean_anom = math.radians(357.52911 + t * (35999.05029 - 0.0001537 * t))
+    eccent = 0.016708634 - t * (0.000042037 + 0.0000001267 * t)
+
+    center = math.radians(
+        math.sin(mean_anom) * (1.914602 - t * (0.004817 + 0.000014 * t))
+        + math.sin(2 * mean_anom) * (0.019993 - 0.000101 * t)
+        + math.sin(3 * mean_anom) * 0.000289
+    )
+    omega = math.radians(125.04 - 1934.136 * t)
+    apparent_long = mean_long + center - math.radians(0.00569 + 0.00478 * math.sin(omega))
+
+    mean_obliq = 23 + (26 + (21.448 - t * (46.815 + t * (0.00059 - t * 0.001813))) / 60) / 60
+    obliq = math.radians(mean_obliq + 0.00256 * math.cos(omega))
+
+    declination = math.asin(math.sin(obliq) * math.sin(apparent_long))
+
+    y = math.tan(obliq / 2) ** 2
+    eq_time = 4 * math.degrees(
+        y * math.sin(2 * mean_long)
+        - 2 * eccent * math.sin(mean_anom)
+        + 4 * eccent * y * math.sin(mean_anom) * math.cos(2 * mean_long)
+        - 0.5 * y * y * math.sin(4 * mean_long)
+        - 1.25 * eccent * eccent * math.sin(2 * mean_anom)
+    )
+    return declination, eq_time
+
+
+def elevation(lat, lon, ts):
+    """Elevation of the sun above the horizon in degrees, without refraction."""
+    declination, eq_time = _sun_terms(ts)
+
+    # True solar time in minutes and the hour angle from it
+    solar_minutes = ((ts % SECONDS_PER_DAY) / 60 + eq_time + 4 * lon) % 1440
+    hour_angle = math.radians(solar_minutes / 4 - 180)
+
+    lat_rad = math.radians(lat)
+    cos_zenith = math.sin(lat_rad) * math.sin(declination) + math.cos(
+        lat_rad
+    ) * math.cos(declination) * math.cos(hour_angle)
+    return 90 - math.degrees(math.acos(max(-1.0, min(1.0, cos_zenith))))
+
+
+def elevations(lat, lon, times):
+    return [elevation(lat, lon, ts) for ts in times]
+
+
+def sun_times(lat, lon, day, utc_offset=0):
+    """(sunrise, sunset, solar noon) timestamps of a day.
+
+    day is a day number (days since 1970-01-01) in the location's local
+    time, utc_offset seconds from GMT, see timeAxis.local_day(). Sunrise
+    and sunset are None when the sun does not cross the horizon that day
+    (polar day or night), use elevation() at solar noon to tell which.
+    """
+    # The UTC date whose solar noon falls on the local day. Where the
+    # offset is far from the one the longitude implies (UTC+14 at 157°W)
+    # it is the date before or after.
+    approx_noon = day * SECONDS_PER_DAY + (720 - 4 * lon) * 60
+    local_noon = day * SECONDS_PER_DAY + SECONDS_PER_DAY // 2 - utc_offset
+    utc_day = day + round((local_noon - approx_noon) / SECONDS_PER_DAY)
+
+    # Terms at the approximate noon, then once more at the solar noon found
+    noon = utc_day * SECONDS_PER_DAY + (720 - 4 * lon) * 60
+    for _ in range(2):
+        declination, eq_time = _sun_terms(noon)
+        noon = utc_day * SECONDS_PER_DAY + (720 - 4 * lon - eq_time) * 60
+
+    lat_rad = math.radians(lat)
+    cos_hour_angle = math.cos(math.radians(SUNRISE_ZENITH)) / (
+        math.cos(lat_rad) * math.cos(declination)
+    ) - math.tan(lat_rad) * math.tan(declination)
+    if not -1 <= cos_hour_angle <= 1:
+        return None, None, noon
+
+    # Hour angle in degrees, the sun moves 1° in 4 minutes
+    half_day = math.degrees(math.acos(cos_hour_angle)) * 4 * 60
+    return noon - half_day, noon + half_day, noon
+
+
+def sun_times_of_days(lat, lon, days, utc_offset=0):
+    """sun_times() of a sequence of day numbers."""
+    return [sun_times(lat, lon, day, utc_offset) for day in days]
+
+
+def sun_times_of_cities(cities, day, utc_offset=0):
+    """sun_times() of day for a sequence of (lat, lon) in the same time zone."""
+    return [sun_times(lat, lon, day, utc_offset) for lat, lon in cities]
+
+
+def day_length(lat, lon, day, utc_offset=0):
+    """Seconds the sun is above the horizon on a day, 0 or 86400 at the poles."""
+    sunrise, sunset, noon = sun_times(lat, lon, day, utc_offset)
+    if sunrise is None:
+        return SECONDS_PER_DAY if elevation(lat, lon, noon) > 0 else 0
+    return sunset - sunrise
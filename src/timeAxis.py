@@ -0,0 +1,73 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+# Series are requested with timezone=auto, the api then gives the offset of
+# the location's local time (utc_offset_seconds). A TimeAxis finds the day
+# boundaries of a series in that time once, so "today", "tomorrow" or "the
+# row of today" are array reads instead of scans over datetimes.
+
+SECONDS_PER_DAY = 86400
+
+
+def local_day(ts, utc_offset=0):
+    """Day number (days since 1970-01-01) of ts in a location's local time."""
+    return int((ts + utc_offset) // SECONDS_PER_DAY)
+
+
+class TimeAxis:
+    """Day boundaries of a sorted series of timestamps.
+
+    Day d of the axis is local day first_day + d and covers the steps
+    day_starts[d]:day_starts[d + 1]. Days the series skips are empty.
+    The offset is the one of the response, a DST change inside the
+    forecast horizon moves later boundaries by an hour.
+    """
+
+    __slots__ = ("utc_offset", "first_day", "day_starts")
+
+    def __init__(self, times, utc_offset=0):
+        self.utc_offset = utc_offset
+        self.first_day = local_day(times[0], utc_offset) if len(times) else 0
+
+        starts = []
+        for i, ts in enumerate(times):
+            day = local_day(ts, utc_offset) - self.first_day
+            while len(starts) <= day:
+                starts.append(i)
+        starts.append(len(times))
+        self.day_starts = starts
+
+    def __len__(self):
+        # Number of days
+        return len(self.day_starts) - 1
+
+    def day_of(self, ts):
+        return local_day(ts, self.utc_offset)
+
+    def day_index(self, ts):
+        """Day of the axis ts falls in, -1 if the series does not cover it."""
+        day = local_day(ts, self.utc_offset) - self.first_day
+        if 0 <= day < len(self):
+            return day
+        return -1
+
+    def today(self):
+        return self.day_index(time.time())
+
+    def day_range(self, day):
+        """(start, end) indices of the steps of a day of the axis."""
+        return self.day_starts[day], self.day_starts[day + 1]
+
+    def first_step(self, ts):
+        """Index of the first step of the local day of ts, -1 if not covered.
+
+        For a daily series this is the row of that day.
+        """
+        day = self.day_index(ts)
+        if day == -1 or self.day_starts[day] == self.day_starts[day + 1]:
+            return -1
+        return self.day_starts[day]
+
+    def local_datetime(self, ts):
+        """Aware datetime of ts in the location's time."""
+        return datetime.fromtimestamp(ts, timezone(timedelta(seconds=self.utc_offset)))
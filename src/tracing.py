@@ -0,0 +1,144 @@
+import os
+import json
+import time
+import atexit
+import threading
+
+# Set MOUSAM_TRACE=/path/to/trace.json to record spans, the file can be
+# opened in chrome://tracing or https://ui.perfetto.dev
+TRACE_ENV = "MOUSAM_TRACE"
+
+trace_file = os.environ.get(TRACE_ENV, "")
+enabled = trace_file != ""
+
+_events = []
+_named_threads = set()
+_lock = threading.Lock()
+_pid = os.getpid()
+_local = threading.local()
+
+
+class _NullSpan:
+    """Shared span used when tracing is disabled, does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start", "parent")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0
+        self.parent = None
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.start = time.monotonic_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.monotonic_ns()
+        _local.stack.pop()
+
+        args = self.args
+        if self.parent is not None:
+            args["parent"] = self.parent
+        if exc_type is not None:
+            args["error"] = exc_type.__name__
+
+        thread = threading.current_thread()
+        event = {
+            "name": self.name,
+            "cat": self.cat,
+            "ph": "X",
+            "ts": self.start / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": _pid,
+            "tid": thread.ident,
+            "args": args,
+        }
+        with _lock:
+            if thread.ident not in _named_threads:
+                _named_threads.add(thread.ident)
+                _events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": _pid,
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            _events.append(event)
+        return False
+
+    def set(self, **args):
+        """Attach extra arguments (bytes, status code...) to the span."""
+        self.args.update(args)
+
+
+def span(name, cat="mousam", **args):
+    """Return a context manager timing the enclosed block.
+
+    Spans opened inside another span on the same thread are nested
+    under it in the exported trace.
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, cat, args)
+
+
+def traced(name=None, cat="mousam"):
+    """Decorator version of span(), a no-op when tracing is disabled."""
+
+    def decorator(func):
+        if not enabled:
+            return func
+        span_name = name or func.__qualname__
+
+        def wrapper(*args, **kwargs):
+            with _Span(span_name, cat, {}):
+                return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    return decorator
+
+
+def export(path=None):
+    """Write recorded spans as Chrome trace-event JSON."""
+    path = path or trace_file
+    if not path:
+        return
+
+    with _lock:
+        events = list(_events)
+
+    with open(path, "w") as trace:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace)
+
+
+if enabled:
+    atexit.register(export)
@@ -1,14 +1,8 @@
 import requests
 import socket
-from datetime import datetime
-import time
-import gi
 from .config import settings
+from .tracing import traced
 
-gi.require_version("Adw", "1")
-from gi.repository import Adw
-
-local_time_data = dict()
 TIMEOUT = 5
 domains = {
     "google": "http://www.google.com",
@@ -37,6 +31,7 @@ def check_internet_domain(url):
         return False
 
 
+@traced("check_internet_connection", cat="network")
 def check_internet_connection():
     if (
         check_internet_socket()
@@ -50,32 +45,6 @@ def check_internet_connection():
     return False
 
 
-def create_toast(text, priority=0):
-    toast = Adw.Toast.new(text)
-    toast.set_priority(Adw.ToastPriority(priority))
-    return toast
-
-
 def get_cords():
-    selected_city_ = settings.selected_city
-    return [float(x) for x in selected_city_.split(",")]
-
-
-def get_time_difference(target_latitude, target_longitude, force=False):
-    global local_time_data
-
-    cord_str = f"{target_latitude}_{target_longitude}"
-    if force is False and local_time_data.get(cord_str) is not None:
-        return local_time_data[cord_str]
-
-    # Get current time in the target location using timeapi.io
-    url = f"https://timeapi.io/api/Time/current/coordinate?latitude={target_latitude}&longitude={target_longitude}"
-    target_time_response = requests.get(url)
-    target_time_data = target_time_response.json()
-    target_current_time = target_time_data["dateTime"]
-    target_time = datetime.strptime(target_current_time[:26], "%Y-%m-%dT%H:%M:%S.%f")
-
-    epoch_diff = time.time() - target_time.timestamp()
-    data = {"epoch_diff": epoch_diff, "target_time": target_time.timestamp()}
-    local_time_data[cord_str] = data
-    return data
+    # (latitude, longitude), parsed once per change of the selected city
+    return settings.selected_cords
@@ -1,22 +1,46 @@
 import time
-import gi
+import datetime
 
-from .backendWeather import Weather
+from .backendWeather import Weather, MAX_FORECAST_DAYS
 from .backendAirPollution import AirPollution
 from .config import settings
-from .Models import CurrentWeather, HourlyWeather, DailyWeather
+from .Models import (
+    CurrentWeather,
+    HourlyWeather,
+    DailyWeather,
+    NowcastWeather,
+    AirQuality,
+)
+from .derivedMetrics import (
+    UV_INDEX,
+    HUMIDITY,
+    PRESSURE,
+    WIND_SPEED,
+    US_AQI,
+    EUROPEAN_AQI,
+    derive_levels,
+    aggregate_days,
+)
 from .utils import get_cords
-from gettext import gettext as _, pgettext as C_
-
-gi.require_version("Gtk", "4.0")
-gi.require_version("Adw", "1")
+from .tracing import span, traced
+from .historyStore import get_history_store, AIR_POLLUTION_FIELDS
+from gettext import gettext as _
 
 current_weather_data = None
 hourly_forecast_data = None
 daily_forecast_data = None
 air_apllution_data = None
+nowcast_data = None
+nowcast_cords = None
+
+# Time of the last successful fetch of each dataset for the selected city
+last_fetched = {}
+
+# Latest current conditions of the other added cities, keyed by (lat, lon)
+city_snapshots = {}
 
 
+@traced("fetch_current_weather")
 def fetch_current_weather():
     global current_weather_data
     # Get current weather data from api
@@ -24,7 +48,8 @@ def fetch_current_weather():
     current_weather_data = obj._get_current_weather(*get_cords())
 
     # create object of current weather data
-    current_weather_data = CurrentWeather(current_weather_data)
+    with span("model.current_weather", cat="model"):
+        current_weather_data = CurrentWeather(current_weather_data)
 
     # Add level strings for diffrent attributes
     current_weather_data.relativehumidity_2m["level_str"] = classify_humidity_level(
@@ -37,15 +62,38 @@ def fetch_current_weather():
         current_weather_data.surface_pressure.get("data")
     )
 
+    # Current data refreshes more often than hourly data, keep the fields
+    # derived from the hourly forecast on the new object
+    if hourly_forecast_data is not None:
+        _add_hourly_fields_to_current()
+
+    last_fetched["current"] = time.time()
+    _record_history(lambda store: store.record_current(*get_cords(), current_weather_data))
     return current_weather_data
 
 
+@traced("fetch_hourly_forecast")
 def fetch_hourly_forecast():
     global hourly_forecast_data
     # Get current weather data from api
     obj = Weather()
     hourly_forecast_data = obj._get_hourly_forecast(*get_cords())
-    hourly_forecast_time_list = hourly_forecast_data.get("hourly").get("time")
+
+    with span("model.hourly_weather", cat="model"):
+        hourly_forecast_data = HourlyWeather(hourly_forecast_data)
+        derive_levels(hourly_forecast_data)
+        aggregate_days(hourly_forecast_data)
+
+    _add_hourly_fields_to_current()
+
+    last_fetched["hourly"] = time.time()
+    return hourly_forecast_data
+
+
+def _add_hourly_fields_to_current():
+    # uv index, dewpoint and visibility of current weather come from the
+    # hourly forecast slot nearest to now
+    hourly_forecast_time_list = hourly_forecast_data.time.get("data")
 
     nearest_current_time_idx = 0
     for i in range(len(hourly_forecast_time_list)):
@@ -53,26 +101,27 @@ def fetch_hourly_forecast():
             nearest_current_time_idx = i
             break
 
-    hourly_forecast_data = HourlyWeather(hourly_forecast_data)
-
-    current_weather_data.uv_index = {
-        "data": hourly_forecast_data.uv_index["data"][nearest_current_time_idx],
-        "level_str": classify_uv_index(
-            hourly_forecast_data.uv_index["data"][nearest_current_time_idx]
+    current_weather_data.set(
+        "uv_index",
+        hourly_forecast_data.uv_index["data"][nearest_current_time_idx],
+        hourly_forecast_data.uv_index["unit"],
+        UV_INDEX.label(
+            hourly_forecast_data.uv_index["category"][nearest_current_time_idx]
         ),
-    }
-    current_weather_data.dewpoint_2m = {
-        "unit": hourly_forecast_data.dewpoint_2m["unit"],
-        "data": hourly_forecast_data.dewpoint_2m["data"][nearest_current_time_idx],
-    }
-    current_weather_data.visibility = transform_visibility_data(
+    )
+    current_weather_data.set(
+        "dewpoint_2m",
+        hourly_forecast_data.dewpoint_2m["data"][nearest_current_time_idx],
+        hourly_forecast_data.dewpoint_2m["unit"],
+    )
+    visibility = transform_visibility_data(
         hourly_forecast_data.visibility["unit"],
         hourly_forecast_data.visibility["data"][nearest_current_time_idx],
     )
-
-    return hourly_forecast_data
+    current_weather_data.set("visibility", visibility["data"], visibility["unit"])
 
 
+@traced("fetch_daily_forecast")
 def fetch_daily_forecast():
     global daily_forecast_data
 
@@ -81,86 +130,222 @@ def fetch_daily_forecast():
     daily_forecast_data = obj._get_daily_forecast(*get_cords())
 
     # create object of daily forecast data
-    daily_forecast_data = DailyWeather(daily_forecast_data)
+    with span("model.daily_weather", cat="model"):
+        daily_forecast_data = DailyWeather(daily_forecast_data)
+        derive_levels(daily_forecast_data)
 
+    last_fetched["daily"] = time.time()
     return daily_forecast_data
 
 
+@traced("fetch_nowcast")
+def fetch_nowcast():
+    global nowcast_data, nowcast_cords
+    obj = Weather()
+    cords = get_cords()
+    data = obj._get_nowcast(*cords)
+
+    with span("model.nowcast", cat="model"):
+        newer = NowcastWeather(data)
+
+    # Only the next steps are requested on refresh, merge them into the
+    # series already loaded for the same city
+    if len(newer.precipitation["data"]) == 0:
+        # Nothing to merge, keep what is loaded unless it is another city's
+        if nowcast_cords != cords:
+            nowcast_data = None
+            nowcast_cords = cords
+    elif nowcast_data is not None and nowcast_cords == cords:
+        nowcast_data.merge(newer, keep_from=time.time() - 15 * 60)
+    else:
+        nowcast_data = newer
+        nowcast_cords = cords
+
+    last_fetched["nowcast"] = time.time()
+    return nowcast_data
+
+
+@traced("fetch_overview")
+def fetch_overview(cities, max_age=15 * 60):
+    """Current conditions and today's high/low of every (lat, lon) in cities.
+
+    Cities with a snapshot younger than max_age are served from
+    city_snapshots, all others are fetched in a single request.
+    """
+    now = time.time()
+    stale = [
+        city
+        for city in cities
+        if snapshot_key(city) not in city_snapshots
+        or now - city_snapshots[snapshot_key(city)]["fetched_at"] >= max_age
+    ]
+
+    if stale:
+        obj = Weather()
+        results = obj._get_overview(stale)
+        with span("model.overview", cat="model", cities=len(stale)):
+            snapshots = []
+            for city, data in zip(stale, results):
+                daily = data.get("daily")
+                snapshot = CurrentWeather(data)
+                city_snapshots[snapshot_key(city)] = {
+                    "fetched_at": now,
+                    "data": snapshot,
+                    "high": daily.get("temperature_2m_max")[0],
+                    "low": daily.get("temperature_2m_min")[0],
+                }
+                snapshots.append((city, snapshot))
+
+        def record(store):
+            for (lat, lon), snapshot in snapshots:
+                store.record_current(lat, lon, snapshot)
+
+        _record_history(record)
+
+    return [city_snapshots[snapshot_key(city)] for city in cities]
+
+
+def snapshot_key(city):
+    # Snapshots are in the unit they were fetched in, switching the unit
+    # must not serve the ones of the other unit
+    return (*city, settings.unit)
+
+
+# ============ On demand loading of further days ============
+def _next_window(time_series, days, utc_offset=0):
+    # Dates of the days after the last loaded time step, None once the
+    # forecast horizon of the api is reached. Dates are in the time zone
+    # utc_offset seconds from GMT.
+    tz = datetime.timezone(datetime.timedelta(seconds=utc_offset))
+    last_day = datetime.datetime.fromtimestamp(time_series[-1], tz).date()
+    last_allowed = datetime.datetime.now(tz).date() + datetime.timedelta(
+        days=MAX_FORECAST_DAYS - 1
+    )
+    start_date = last_day + datetime.timedelta(days=1)
+    end_date = min(start_date + datetime.timedelta(days=days - 1), last_allowed)
+    if start_date > end_date:
+        return None
+    return start_date, end_date
+
+
+@traced("extend_hourly_forecast")
+def extend_hourly_forecast(days=1):
+    """Append the next days of hourly data, False once nothing is left to load."""
+    hourly_data = hourly_forecast_data
+    window = _next_window(
+        hourly_data.time.get("data"), days, hourly_data.utc_offset_seconds
+    )
+    if window is None:
+        return False
+
+    obj = Weather()
+    data = obj._get_hourly_forecast(*get_cords(), *window)
+    with span("model.hourly_weather", cat="model"):
+        hourly_data.extend(HourlyWeather(data))
+        derive_levels(hourly_data)
+        aggregate_days(hourly_data)
+    return True
+
+
+@traced("extend_daily_forecast")
+def extend_daily_forecast(days=MAX_FORECAST_DAYS):
+    """Append the next days of daily data, False once nothing is left to load."""
+    daily_data = daily_forecast_data
+    window = _next_window(
+        daily_data.time.get("data"), days, daily_data.utc_offset_seconds
+    )
+    if window is None:
+        return False
+
+    obj = Weather()
+    data = obj._get_daily_forecast(*get_cords(), *window)
+    with span("model.daily_weather", cat="model"):
+        daily_data.extend(DailyWeather(data))
+        derive_levels(daily_data)
+    return True
+
+
+@traced("fetch_current_air_pollution")
 def fetch_current_air_pollution():
     global air_apllution_data
     obj = AirPollution()
-    air_apllution_data = obj._get_current_air_pollution(*get_cords())
+    data = obj._get_current_air_pollution(*get_cords())
+    with span("model.air_quality", cat="model"):
+        air_apllution_data = AirQuality(data)
+    last_fetched["air_pollution"] = time.time()
+    _record_history(_record_air_pollution)
     return air_apllution_data
 
 
+def _record_air_pollution(store):
+    # Store the hours that have already been observed, not the forecast
+    fields = AIR_POLLUTION_FIELDS
+    now = time.time()
+    snapshots = []
+    for i, ts in enumerate(air_apllution_data.time.get("data")):
+        if ts > now:
+            break
+        snapshots.append((ts, air_apllution_data.snapshot(i, fields)))
+    store.record_air_pollution(*get_cords(), snapshots)
+
+
+def _record_history(record):
+    # Opt-in in preferences. Without persistent settings (tests, workers,
+    # MOUSAM_SETTINGS=memory) the database on disk is never touched.
+    if not settings.is_persistent or not settings.is_recording_history:
+        return
+
+    # History is optional, never let a storage problem break a refresh
+    try:
+        record(get_history_store())
+    except Exception as e:
+        print(f"Could not record history: {e}")
+
+
 def classify_aqi(aqi_value):
-    if aqi_value >= 0 and aqi_value <= 50:
-        return _("Good")
-    elif aqi_value <= 100:
-        return _("Moderate")
-    elif aqi_value <= 150:
-        return _("Poor")
-    elif aqi_value <= 200:
-        return _("Unhealthy")
-    elif aqi_value <= 300:
-        return _("Severe")
-    else:
-        return _("Hazardous")
+    return US_AQI.classify(aqi_value)
+
+
+def aqi_category_label(category):
+    # category as computed by AirQuality.us_category
+    return US_AQI.label(category)
+
+
+def european_aqi_category_label(category):
+    return EUROPEAN_AQI.label(category)
 
 
 # ========= Classify diffrent attributes of current weather ==========
 
 
 def classify_uv_index(uv_index):
-    if uv_index <= 2:
-        return C_("uvindex", "Low")
-    elif uv_index <= 5:
-        return C_("uvindex", "Moderate")
-    elif uv_index <= 7:
-        return C_("uvindex", "High")
-    elif uv_index <= 10:
-        return C_("uvindex", "Very High")
-    else:
-        return C_("uvindex", "Extreme")
+    return UV_INDEX.classify(uv_index)
 
 
-def classify_humidity_level(uv_index):
-    if uv_index < 50:
-        return C_("humidity", "Low")
-    elif uv_index <= 80:
-        return C_("humidity", "Moderate")
-    else:
-        return C_("humidity", "High")
+def classify_humidity_level(humidity):
+    return HUMIDITY.classify(humidity)
 
 
 def classify_presssure_level(pressure):
-    if pressure < 940:
-        return C_("pressure", "Low")
-    elif pressure <= 1010:
-        return C_("pressure", "Normal")
-    else:
-        return C_("pressure", "High")
+    return PRESSURE.classify(pressure)
 
 
 def classify_wind_speed_level(wind_speed):
-    if wind_speed <= 1:
-        return _("Calm")
-    elif wind_speed <= 25:
-        return _("Light")
-    elif wind_speed <= 40:
-        return C_("wind", "Moderate")
-    elif wind_speed <= 60:
-        return _("Strong")
-    else:
-        return C_("wind", "Extreme")
+    return WIND_SPEED.classify(wind_speed)
 
 
 def transform_visibility_data(unit, data):
+    # data is a single value or a whole series
     dist_unit = _("km")
-    dist = data / 1000
+    factor = 1000
     if settings.unit == "imperial":
         dist_unit = _("miles")
-        dist = data / 1609.34
+        factor = 1609.34
+
+    if isinstance(data, (int, float)):
+        dist = data / factor
+    else:
+        dist = [None if v is None else v / factor for v in data]
 
     if unit.lower() == "m":
         data = dist
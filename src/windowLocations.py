@@ -1,9 +1,9 @@
 import threading
 import time
 import gi
-from gi.repository import Gtk, Adw
+from gi.repository import Gtk, Adw, GLib
 
-from .utils import create_toast
+from .frontendUtils import create_toast
 from .backendFindCity import find_city
 from .config import settings
 from gettext import gettext as _, pgettext as C_
@@ -15,6 +15,10 @@ gi.require_version("Adw", "1")
 global updated_at
 updated_at = time.time()
 
+# Milliseconds of typing pause before a search is sent
+SEARCH_DEBOUNCE = 300
+MIN_QUERY_LENGTH = 2
+
 
 class WeatherLocations(Adw.PreferencesWindow):
     def __init__(self, application, **kwargs):
@@ -162,6 +166,7 @@ class WeatherLocations(Adw.PreferencesWindow):
 
         self.search_entry = Gtk.Entry()
         self.search_entry.connect("activate", self._on_find_city_clicked)
+        self.search_entry.connect("changed", self._on_search_changed)
         self.search_entry.set_icon_from_icon_name(
             Gtk.EntryIconPosition(1), "edit-clear-symbolic"
         )
@@ -178,6 +183,9 @@ class WeatherLocations(Adw.PreferencesWindow):
 
         self._dialog.serach_res_grp = Adw.PreferencesGroup()
         self._dialog.serach_res_grp.set_hexpand(True)
+        self.search_page_start = None
+        self._search_source_id = None
+        self._search_generation = 0
         self._blank_search_page("start")
         self._dialog.group.add(self._dialog.serach_res_grp)
 
@@ -191,45 +199,106 @@ class WeatherLocations(Adw.PreferencesWindow):
 
     # =========== Click on find city ===========
     def _on_find_city_clicked(self, widget):
+        self._cancel_pending_search()
         self._find_city(widget)
 
+    # =========== Search as you type ===========
+    def _on_search_changed(self, entry):
+        # Search once typing pauses, every keystroke restarts the timer
+        self._cancel_pending_search()
+        self._search_source_id = GLib.timeout_add(
+            SEARCH_DEBOUNCE, self._on_search_timeout
+        )
+
+    def _on_search_timeout(self):
+        self._search_source_id = None
+        self._find_city(self.search_entry)
+        return GLib.SOURCE_REMOVE
+
+    def _cancel_pending_search(self):
+        if self._search_source_id is not None:
+            GLib.source_remove(self._search_source_id)
+            self._search_source_id = None
+
     # =========== Find city ===========
     def _find_city(self, widget):
-        text = self.search_entry.get_text()
+        text = self.search_entry.get_text().strip()
+
+        # A newer query supersedes the ones still running, their results
+        # are dropped when they arrive
+        self._search_generation += 1
+        generation = self._search_generation
 
-        # Matched city from api
+        if len(text) < MIN_QUERY_LENGTH:
+            self._clear_search_results()
+            self._blank_search_page("start")
+            return
+
+        thread = threading.Thread(
+            target=self._search_worker, args=(generation, text), name="find_city"
+        )
+        thread.start()
+
+    def _search_worker(self, generation, text):
+        # Matched city from api, runs off the main thread
         city_data = find_city(text, 5)
-        self._dialog.serach_res_grp.remove(self.search_page_start)
+        GLib.idle_add(self._on_search_done, generation, city_data)
 
-        if len(self._dialog.search_results) > 0:
-            for action_row in self._dialog.search_results:
-                self._dialog.serach_res_grp.remove(action_row)
-            self._dialog.search_results.clear()
+    def _on_search_done(self, generation, city_data):
+        if generation != self._search_generation:
+            return GLib.SOURCE_REMOVE
 
-        # Plot search results if found
+        self._clear_search_results()
+
+        # Plot search results if found, one row per main loop iteration
         if city_data:
-            for loc in city_data:
-                res_row = Adw.ActionRow.new()
-                res_row.set_activatable(True)
-                title_arr = [loc.name, loc.state, loc.country]
-                title_arr = [x for x in title_arr if x is not None]
-                title = ",".join(title_arr)
-                res_row.set_title(title)
-
-                # Skip plotting the location in the search results if it has invalid cords
-                if loc.latitude is None or loc.longitude is None:
-                    continue
-                if loc.latitude == "" or loc.longitude == "":
-                    continue
-
-                res_row.set_subtitle(f"{loc.latitude},{loc.longitude}")
-                res_row.connect("activated", self._add_city)
-                self._dialog.search_results.append(res_row)
-                self._dialog.serach_res_grp.add(res_row)
+            GLib.idle_add(self._append_result_row, generation, iter(city_data))
+
+        # The search failed, e.g. no connection
+        elif city_data is None:
+            self._blank_search_page(status="error")
 
         # If no search result is found
         else:
             self._blank_search_page(status="no_res")
+        return GLib.SOURCE_REMOVE
+
+    def _append_result_row(self, generation, city_data):
+        if generation != self._search_generation:
+            return GLib.SOURCE_REMOVE
+
+        loc = next(city_data, None)
+        if loc is None:
+            return GLib.SOURCE_REMOVE
+
+        # Skip plotting the location in the search results if it has invalid cords
+        if loc.latitude is None or loc.longitude is None:
+            return GLib.SOURCE_CONTINUE
+        if loc.latitude == "" or loc.longitude == "":
+            return GLib.SOURCE_CONTINUE
+
+        res_row = Adw.ActionRow.new()
+        res_row.set_activatable(True)
+        title_arr = [loc.name, loc.state, loc.country]
+        title_arr = [x for x in title_arr if x is not None]
+        title = ",".join(title_arr)
+        res_row.set_title(title)
+
+        res_row.set_subtitle(f"{loc.latitude},{loc.longitude}")
+        res_row.connect("activated", self._add_city)
+        self._dialog.search_results.append(res_row)
+        self._dialog.serach_res_grp.add(res_row)
+        return GLib.SOURCE_CONTINUE
+
+    def _clear_search_results(self):
+        if self.search_page_start is not None:
+            self._dialog.serach_res_grp.remove(self.search_page_start)
+            self.search_page_start = None
+
+        if len(self._dialog.search_results) > 0:
+            for action_row in self._dialog.search_results:
+                self._dialog.serach_res_grp.remove(action_row)
+            self._dialog.search_results.clear()
 
     # =========== Add City on selection ===========
     def _add_city(self, widget):
@@ -283,11 +352,14 @@ class WeatherLocations(Adw.PreferencesWindow):
         self.add_toast(create_toast(_("Deleted - {0}".format(widget.get_title())), 1))
 
     def _blank_search_page(self, status):
-        text = _("Press enter to search")
+        text = _("Type a city name to search")
         icon = "system-search-symbolic"
         if status == "no_res":
             text = _("No results found!")
             icon = "system-search-symbolic"
+        elif status == "error":
+            text = _("Search failed, check your connection")
+            icon = "network-error-symbolic"
 
         self.search_page_start = Gtk.Box(
             orientation=Gtk.Orientation.VERTICAL,
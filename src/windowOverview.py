@@ -0,0 +1,183 @@
+import threading
+import gi
+from gi.repository import Gtk, Adw, Gio, GLib, GObject
+
+from .constants import icons, conditon
+from .config import settings
+from .backendTransport import TransportError
+from gettext import gettext as _
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+
+
+class CityItem(GObject.Object):
+    """Row of the overview list, snapshot is filled once it is fetched."""
+
+    def __init__(self, name, key):
+        super().__init__()
+        self.name = name
+        self.key = key  # "lat,lon" as stored in settings
+        self.cords = tuple(float(x) for x in key.split(","))
+        self.snapshot = None
+
+
+class WeatherOverview(Adw.Window):
+    """Current conditions of every added city side by side.
+
+    All cities are fetched in one request, rows are recycled by the list
+    view so the window stays light with many cities.
+    """
+
+    def __init__(self, application, **kwargs):
+        super().__init__(**kwargs)
+        self.application = application
+        self.set_title(_("Overview"))
+        self.set_transient_for(application)
+        self.set_modal(True)
+        self.set_default_size(420, 500)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        self.set_content(box)
+        box.append(Adw.HeaderBar())
+
+        self.stack = Gtk.Stack(vexpand=True)
+        box.append(self.stack)
+
+        spinner = Gtk.Spinner(halign=Gtk.Align.CENTER, valign=Gtk.Align.CENTER)
+        spinner.set_size_request(32, 32)
+        spinner.start()
+        self.stack.add_named(spinner, "loading")
+
+        self.status_page = Adw.StatusPage()
+        self.status_page.set_icon_name("network-error-symbolic")
+        self.stack.add_named(self.status_page, "error")
+
+        # List of cities
+        self.store = Gio.ListStore(item_type=CityItem)
+        for city in settings.added_cities:
+            parts = city.split(",")
+            key = f"{parts[-2]},{parts[-1]}"
+            self.store.append(CityItem(",".join(parts[:-2]), key))
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_setup_row)
+        factory.connect("bind", self._on_bind_row)
+
+        selection = Gtk.NoSelection(model=self.store)
+        list_view = Gtk.ListView(model=selection, factory=factory)
+        list_view.set_single_click_activate(True)
+        list_view.add_css_class("navigation-sidebar")
+        list_view.connect("activate", self._on_row_activated)
+
+        scrolled_window = Gtk.ScrolledWindow(vexpand=True)
+        scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
+        scrolled_window.set_child(list_view)
+        self.stack.add_named(scrolled_window, "list")
+
+        self.stack.set_visible_child_name("loading")
+        thread = threading.Thread(target=self._load, name="overview")
+        thread.start()
+
+    # ============ Loading ============
+    def _load(self):
+        from .weatherData import fetch_overview
+
+        cities = [self.store.get_item(i).cords for i in range(self.store.get_n_items())]
+        try:
+            snapshots = fetch_overview(cities)
+        except TransportError as e:
+            GLib.idle_add(self._show_error, str(e))
+            return
+        GLib.idle_add(self._fill, snapshots)
+
+    def _fill(self, snapshots):
+        for i, snapshot in enumerate(snapshots):
+            self.store.get_item(i).snapshot = snapshot
+        # Tell the list view every row changed, bound rows are bound again
+        n_items = self.store.get_n_items()
+        self.store.items_changed(0, n_items, n_items)
+        self.stack.set_visible_child_name("list")
+
+    def _show_error(self, desc):
+        self.status_page.set_title(_("Could not load weather"))
+        self.status_page.set_description(desc)
+        self.stack.set_visible_child_name("error")
+
+    # ============ Rows ============
+    def _on_setup_row(self, factory, list_item):
+        row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        row.set_margin_top(6)
+        row.set_margin_bottom(6)
+
+        row.icon = Gtk.Image()
+        row.icon.set_pixel_size(36)
+        row.append(row.icon)
+
+        text_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, hexpand=True)
+        text_box.set_valign(Gtk.Align.CENTER)
+        row.append(text_box)
+
+        row.name_label = Gtk.Label(halign=Gtk.Align.START)
+        row.name_label.set_css_classes(["text-4", "bold-2"])
+        text_box.append(row.name_label)
+
+        row.cond_label = Gtk.Label(halign=Gtk.Align.START)
+        row.cond_label.set_css_classes(["text-6", "light-3"])
+        text_box.append(row.cond_label)
+
+        temp_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        temp_box.set_valign(Gtk.Align.CENTER)
+        row.append(temp_box)
+
+        row.temp_label = Gtk.Label(halign=Gtk.Align.END)
+        row.temp_label.set_css_classes(["text-3", "bold-2"])
+        temp_box.append(row.temp_label)
+
+        row.range_label = Gtk.Label(halign=Gtk.Align.END)
+        row.range_label.set_css_classes(["text-6", "light-3"])
+        temp_box.append(row.range_label)
+
+        list_item.set_child(row)
+
+    def _on_bind_row(self, factory, list_item):
+        row = list_item.get_child()
+        item = list_item.get_item()
+        row.name_label.set_text(item.name)
+
+        if item.snapshot is None:
+            row.icon.clear()
+            row.cond_label.set_text("")
+            row.temp_label.set_text("")
+            row.range_label.set_text("")
+            return
+
+        data = item.snapshot["data"]
+        weather_code = str(data.weathercode.get("data"))
+        condition_icon = icons[weather_code]
+        if data.is_day.get("data") == 0:
+            condition_icon = icons[weather_code + "n"]
+        row.icon.set_from_resource(condition_icon)
+        row.cond_label.set_text(conditon[weather_code])
+        row.temp_label.set_text(
+            "{0:.0f} {1}".format(
+                data.temperature_2m.get("data"), data.temperature_2m.get("unit")
+            )
+        )
+
+        high = item.snapshot.get("high")
+        low = item.snapshot.get("low")
+        if high is not None and low is not None:
+            row.range_label.set_text(f"{high:.0f}° / {low:.0f}°")
+        else:
+            row.range_label.set_text("")
+
+    def _on_row_activated(self, list_view, position):
+        item = self.store.get_item(position)
+        if settings.selected_city != item.key:
+            settings.selected_city = item.key
+            thread = threading.Thread(
+                target=self.application._load_weather_data, name="load_data"
+            )
+            thread.start()
+        self.close()
@@ -2,8 +2,9 @@ import gi
 import time
 import threading
 from gi.repository import Gtk, Adw,GLib
-from .utils import create_toast
+from .frontendUtils import create_toast
 from .config import settings
+from . import fieldRegistry
 from gettext import gettext as _, pgettext as C_
 
 gi.require_version('Gtk', '4.0')
@@ -117,6 +118,35 @@ class WeatherPreferences(Adw.PreferencesWindow):
         self.prec_unit_switch_box.append(self.use_inch_switch)
         self.prec_unit.add_suffix(self.prec_unit_switch_box)
         self.prec_unit_group.add(self.prec_unit)
+
+        # Background refresh of all cities
+        self.refresh_group = Adw.PreferencesGroup.new()
+        self.refresh_group.set_margin_top(20)
+        self.appearance_grp.add(self.refresh_group)
+
+        self.refresh_all_row = Adw.ActionRow.new()
+        self.refresh_all_row.set_title(_('Refresh all locations'))
+        self.refresh_all_row.set_subtitle(_("Keep conditions of every added location up to date in background"))
+        self.refresh_all_switch_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL,valign=Gtk.Align.CENTER)
+        self.refresh_all_row.set_activatable(True)
+        self.refresh_all_switch = Gtk.Switch()
+        self.refresh_all_switch.set_active(settings.should_refresh_all_cities)
+        self.refresh_all_switch.connect("state-set",self._on_refresh_all_cities)
+        self.refresh_all_switch_box.append(self.refresh_all_switch)
+        self.refresh_all_row.add_suffix(self.refresh_all_switch_box)
+        self.refresh_group.add(self.refresh_all_row)
+
+        self.history_row = Adw.ActionRow.new()
+        self.history_row.set_title(_('Record weather history'))
+        self.history_row.set_subtitle(_("Store observed conditions of your locations on this device"))
+        self.history_switch_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL,valign=Gtk.Align.CENTER)
+        self.history_row.set_activatable(True)
+        self.history_switch = Gtk.Switch()
+        self.history_switch.set_active(settings.is_recording_history)
+        self.history_switch.connect("state-set",self._on_record_history)
+        self.history_switch_box.append(self.history_switch)
+        self.history_row.add_suffix(self.history_switch_box)
+        self.refresh_group.add(self.history_row)
         
     # =============== Appearance Methods  ===============
     def _use_gradient_bg(self,widget,state):
@@ -146,3 +176,10 @@ class WeatherPreferences(Adw.PreferencesWindow):
     
     def _use_inch_for_precipation(self,widget,state):
         settings.is_using_inch_for_prec = state
+
+    def _on_refresh_all_cities(self,widget,state):
+        settings.should_refresh_all_cities = state
+
+    def _on_record_history(self,widget,state):
+        settings.is_recording_history = state
+        fieldRegistry.set_active("history", state)
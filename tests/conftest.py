@@ -0,0 +1,19 @@
+import os
+import sys
+import builtins
+import importlib.util
+from pathlib import Path
+
+# The modules in src/ are installed as the "mousam" package, load them the
+# same way so their relative imports work. Only the GTK free data layer
+# is tested, settings are kept in memory.
+os.environ.setdefault("MOUSAM_SETTINGS", "memory")
+builtins.__dict__.setdefault("_", lambda text: text)
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+if "mousam" not in sys.modules:
+    spec = importlib.util.spec_from_loader("mousam", loader=None, is_package=True)
+    package = importlib.util.module_from_spec(spec)
+    package.__path__ = [str(SRC)]
+    sys.modules["mousam"] = package
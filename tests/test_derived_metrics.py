@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mousam.derivedMetrics import (
+    HUMIDITY,
+    PRESSURE,
+    UV_INDEX,
+    WIND_SPEED,
+    ThresholdTable,
+    aggregate_days,
+    below,
+)
+from mousam.timeAxis import TimeAxis
+
+
+@pytest.mark.parametrize(
+    "table, value, label",
+    [
+        # Same bands as the if/elif classifiers they replace
+        (UV_INDEX, 2, "Low"),
+        (UV_INDEX, 2.1, "Moderate"),
+        (UV_INDEX, 7, "High"),
+        (UV_INDEX, 10, "Very High"),
+        (UV_INDEX, 11, "Extreme"),
+        (HUMIDITY, 49.9, "Low"),
+        (HUMIDITY, 50, "Moderate"),
+        (HUMIDITY, 80, "Moderate"),
+        (HUMIDITY, 81, "High"),
+        (PRESSURE, 939, "Low"),
+        (PRESSURE, 940, "Normal"),
+        (PRESSURE, 1011, "High"),
+        (WIND_SPEED, 1, "Calm"),
+        (WIND_SPEED, 25, "Light"),
+        (WIND_SPEED, 40, "Moderate"),
+        (WIND_SPEED, 61, "Extreme"),
+    ],
+)
+def test_classify_matches_bands(table, value, label):
+    assert table.classify(value) == label
+
+
+def test_series_are_classified_in_one_pass():
+    categories = UV_INDEX.categories([0, 3, None, 12])
+    assert list(categories) == [0, 1, -1, 4]
+    assert UV_INDEX.classify_series([0, None, 8]) == ["Low", "", "Very High"]
+    assert UV_INDEX.label(-1) == ""
+
+
+def test_below_makes_a_strict_bound():
+    table = ThresholdTable([below(5)], [("", "under"), ("", "over")])
+    assert table.category(4.999) == 0
+    assert table.category(5) == 1
+
+
+def test_table_needs_one_label_more_than_bounds():
+    with pytest.raises(AssertionError):
+        ThresholdTable([1, 2], [(None, "a"), (None, "b")])
+
+
+def test_aggregate_days_per_local_day():
+    # Three hours on the first local day and two on the next, UTC+2
+    offset = 2 * 3600
+    start = 86400 * 100 - offset + 21 * 3600
+    times = [start + i * 3600 for i in range(5)]
+    model = SimpleNamespace(
+        time={"data": times},
+        weathercode={"data": [1, 2, 3, 4, 5]},
+        temperature_2m={"data": [10, 14, 12, None, 7]},
+    )
+    model.axis = TimeAxis(times, offset)
+
+    aggregate_days(model)
+
+    series = model.temperature_2m
+    assert series["day_min"] == [10, 7]
+    assert series["day_max"] == [14, 7]
+    assert series["day_sum"] == [36, 7]
+    assert series["day_argmax"] == [1, 4]
+    assert "day_max" not in model.weathercode
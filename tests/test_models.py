@@ -0,0 +1,64 @@
+from mousam.Models import CurrentWeather, HourlyWeather
+
+
+def current(temperature, unit="°C", **extra):
+    return {
+        "current": {"time": 0, "temperature_2m": temperature, **extra},
+        "current_units": {"time": "unixtime", "temperature_2m": unit},
+    }
+
+
+def test_records_share_one_unit_schema():
+    a = CurrentWeather(current(20.5))
+    b = CurrentWeather(current(3.0))
+    assert a.units is b.units
+    assert a.temperature_2m.get("data") == 20.5
+    assert b.temperature_2m.get("unit") == "°C"
+
+    fahrenheit = CurrentWeather(current(70.0, "°F"))
+    assert fahrenheit.units is not a.units
+
+
+def test_values_filled_in_later():
+    weather = CurrentWeather(current(20.5))
+    assert not weather.has("uv_index")
+    assert weather.uv_index.get("data") is None
+
+    weather.set("uv_index", 3, "", "Moderate")
+    weather.relativehumidity_2m["level_str"] = "Low"
+
+    assert weather.uv_index.get("level_str") == "Moderate"
+    assert not weather.has("relativehumidity_2m")
+    # Other records keep the schema they were made with
+    assert CurrentWeather(current(1.0)).uv_index.get("unit") is None
+
+
+def test_unknown_fields_are_dropped():
+    weather = CurrentWeather(current(20.5, snowfall=1.0))
+    assert not hasattr(weather, "snowfall")
+    assert list(weather.fields()) == ["time", "temperature_2m"]
+
+
+def hourly(times, **series):
+    return HourlyWeather(
+        {"hourly": {"time": times, **series}, "hourly_units": {}, "utc_offset_seconds": 0}
+    )
+
+
+def test_extend_appends_new_steps_only():
+    model = hourly([0, 3600], temperature_2m=[1, 2])
+    model.extend(hourly([3600, 7200, 10800], temperature_2m=[2, 3, 4]))
+
+    assert list(model.time["data"]) == [0, 3600, 7200, 10800]
+    assert list(model.temperature_2m["data"]) == [1, 2, 3, 4]
+
+
+def test_extend_keeps_series_aligned_with_time():
+    model = hourly([0, 3600], temperature_2m=[1, 2], uv_index=[0, 1])
+    model.extend(hourly([7200, 10800], temperature_2m=[3, 4], visibility=[9, 8]))
+
+    steps = len(model.time["data"])
+    assert list(model.uv_index["data"]) == [0, 1, None, None]
+    assert list(model.visibility["data"]) == [None, None, 9, 8]
+    assert len(model.temperature_2m["data"]) == steps
+    assert len(model.axis) == 1
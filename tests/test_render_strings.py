@@ -0,0 +1,20 @@
+from mousam.config import settings
+from mousam.renderStrings import time_label, time_labels, weekday_label
+
+HOUR = 3600
+
+
+def test_time_labels_in_the_location_time_zone():
+    settings.is_using_24h_clock = True
+    # 1970-01-01 00:00 UTC, a Thursday
+    assert time_label(0, 14 * HOUR) == "14:00"
+    assert time_label(0, -5 * HOUR) == "19:00"
+    assert time_labels([0, HOUR], 2 * HOUR) == ["02:00", "03:00"]
+    assert weekday_label(0, -5 * HOUR) == "Wednesday"
+
+
+def test_clock_format_follows_preferences():
+    settings.is_using_24h_clock = False
+    assert time_label(13 * HOUR, 0) == "01:00 PM"
+    settings.is_using_24h_clock = True
+    assert time_label(13 * HOUR, 0) == "13:00"
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from mousam.solarPosition import day_length, elevation, sun_times
+from mousam.timeAxis import local_day
+
+HOUR = 3600
+
+
+def local_times(lat, lon, date, utc_offset):
+    tz = timezone(timedelta(seconds=utc_offset))
+    day = local_day(datetime(*date, 12, tzinfo=tz).timestamp(), utc_offset)
+    return [
+        None if ts is None else datetime.fromtimestamp(ts, tz)
+        for ts in sun_times(lat, lon, day, utc_offset)
+    ]
+
+
+@pytest.mark.parametrize(
+    "lat, lon, utc_offset, sunrise, sunset",
+    [
+        (51.5074, -0.1278, 1 * HOUR, "04:43", "21:21"),  # London
+        (40.7128, -74.006, -4 * HOUR, "05:25", "20:30"),  # New York
+        (-33.8688, 151.2093, 10 * HOUR, "07:00", "16:53"),  # Sydney
+    ],
+)
+def test_sunrise_and_sunset(lat, lon, utc_offset, sunrise, sunset):
+    rise, set_, noon = local_times(lat, lon, (2024, 6, 21), utc_offset)
+    assert rise.strftime("%H:%M") == sunrise
+    assert set_.strftime("%H:%M") == sunset
+    assert rise < noon < set_
+
+
+@pytest.mark.parametrize(
+    "lon, utc_offset",
+    [
+        (-157.4, 14 * HOUR),  # Kiritimati, a day ahead of its longitude
+        (-170.7, -11 * HOUR),  # Pago Pago
+        (172.9, 12 * HOUR),  # Tarawa
+    ],
+)
+def test_times_fall_on_the_local_date(lon, utc_offset):
+    for time in local_times(1.9, lon, (2024, 6, 21), utc_offset):
+        assert time.date() == datetime(2024, 6, 21).date()
+
+
+def test_polar_day_and_night():
+    summer = local_times(78.2, 15.6, (2024, 6, 21), 2 * HOUR)
+    assert summer[:2] == [None, None]
+    assert elevation(78.2, 15.6, summer[2].timestamp()) > 0
+
+    day = local_day(datetime(2024, 6, 21, tzinfo=timezone.utc).timestamp())
+    assert day_length(78.2, 15.6, day, 2 * HOUR) == 86400
+    assert day_length(-78.2, 15.6, day, 2 * HOUR) == 0
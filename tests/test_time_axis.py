@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+from mousam.timeAxis import TimeAxis, local_day
+
+HOUR = 3600
+DAY = 86400
+
+
+def hours(start, count):
+    return [start + i * HOUR for i in range(count)]
+
+
+def test_local_day_uses_the_offset():
+    ts = 10 * DAY + 23 * HOUR  # 23:00 UTC
+    assert local_day(ts) == 10
+    assert local_day(ts, 2 * HOUR) == 11
+    assert local_day(ts, -23 * HOUR - 1) == 9
+
+
+def test_days_start_at_local_midnight():
+    offset = 14 * HOUR
+    # Local midnight of day 20 in UTC+14
+    midnight = 20 * DAY - offset
+    axis = TimeAxis(hours(midnight, 48), offset)
+
+    assert len(axis) == 2
+    assert axis.first_day == 20
+    assert axis.day_range(0) == (0, 24)
+    assert axis.day_range(1) == (24, 48)
+
+
+def test_partial_first_day():
+    offset = -5 * HOUR
+    times = hours(30 * DAY - offset + 18 * HOUR, 12)  # 18:00 local onwards
+    axis = TimeAxis(times, offset)
+
+    assert len(axis) == 2
+    assert axis.day_range(0) == (0, 6)
+    assert axis.first_step(times[7]) == 6
+
+
+def test_day_index_outside_the_series():
+    times = hours(40 * DAY, 24)
+    axis = TimeAxis(times)
+    assert axis.day_index(times[0] - 1) == -1
+    assert axis.day_index(times[-1] + HOUR) == -1
+    assert axis.first_step(times[0] + 5 * DAY) == -1
+
+
+def test_skipped_days_are_empty():
+    times = [50 * DAY, 52 * DAY]
+    axis = TimeAxis(times)
+
+    assert len(axis) == 3
+    assert axis.day_range(1) == (1, 1)
+    assert axis.first_step(51 * DAY) == -1
+    assert axis.first_step(52 * DAY + HOUR) == 1
+
+
+def test_empty_series():
+    axis = TimeAxis([])
+    assert len(axis) == 0
+    assert axis.day_index(0) == -1
+
+
+def test_local_datetime():
+    axis = TimeAxis([0], 5 * HOUR + 30 * 60)
+    assert axis.local_datetime(0) == datetime(
+        1970, 1, 1, 5, 30, tzinfo=timezone(timedelta(hours=5, minutes=30))
+    )
@@ -0,0 +1,195 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from mousam import backendTransport as transport
+from mousam.backendTransport import TransportError, get_json
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b"{}", headers=None):
+        self.status_code = status
+        self.content = body
+        self.headers = headers or {}
+        self.url = "https://api.test/"
+        self.elapsed = _Elapsed()
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} for url: {self.url}", response=self
+            )
+
+
+class _Elapsed:
+    def total_seconds(self):
+        return 0.0
+
+
+class FakeSession:
+    """Answers requests from a list, records the headers of each one."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(headers or {})
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        if callable(answer):
+            return answer()
+        return answer
+
+
+@pytest.fixture(autouse=True)
+def fresh_transport(monkeypatch):
+    transport._cache.clear()
+    transport._inflight.clear()
+    for endpoint in transport.TIMEOUTS:
+        monkeypatch.setitem(
+            transport.breakers,
+            endpoint,
+            transport.CircuitBreaker(transport.BREAKER_THRESHOLD, transport.BREAKER_COOLDOWN),
+        )
+    monkeypatch.setattr(
+        transport, "retry_budget", transport.RetryBudget(transport.RETRY_BUDGET, 30)
+    )
+    monkeypatch.setattr(transport, "_retry_delay", lambda attempt, response: 0)
+
+
+def use_session(monkeypatch, *answers):
+    session = FakeSession(*answers)
+    monkeypatch.setattr(transport, "session", session)
+    return session
+
+
+def test_fresh_cache_sends_no_request(monkeypatch):
+    session = use_session(monkeypatch, FakeResponse(body=b'{"a": 1}'))
+    assert get_json("weather", "https://api.test/a") == {"a": 1}
+    assert get_json("weather", "https://api.test/a") == {"a": 1}
+    assert len(session.calls) == 1
+
+
+def test_not_modified_reuses_cached_body(monkeypatch):
+    session = use_session(
+        monkeypatch,
+        FakeResponse(body=b'{"a": 1}', headers={"ETag": '"v1"'}),
+        FakeResponse(status=304, body=b""),
+    )
+    get_json("weather", "https://api.test/a")
+    transport.expire_cache()
+
+    assert get_json("weather", "https://api.test/a") == {"a": 1}
+    assert session.calls[1]["If-None-Match"] == '"v1"'
+    # The 304 renewed the ttl
+    assert get_json("weather", "https://api.test/a") == {"a": 1}
+    assert len(session.calls) == 2
+
+
+def test_retries_then_succeeds(monkeypatch):
+    session = use_session(
+        monkeypatch,
+        FakeResponse(status=503),
+        requests.exceptions.ConnectionError("down"),
+        FakeResponse(body=b'{"ok": true}'),
+    )
+    assert get_json("weather", "https://api.test/a") == {"ok": True}
+    assert len(session.calls) == 3
+
+
+def test_failure_falls_back_to_last_good_response(monkeypatch):
+    use_session(monkeypatch, FakeResponse(body=b'{"a": 1}'))
+    get_json("weather", "https://api.test/a")
+    transport.expire_cache()
+
+    use_session(monkeypatch, FakeResponse(status=500))
+    assert get_json("weather", "https://api.test/a") == {"a": 1}
+
+
+def test_failure_without_cache_raises(monkeypatch):
+    use_session(monkeypatch, requests.exceptions.Timeout("slow"))
+    with pytest.raises(TransportError):
+        get_json("weather", "https://api.test/a")
+
+
+def test_breaker_opens_on_unavailable_server(monkeypatch):
+    session = use_session(monkeypatch, FakeResponse(status=503))
+    for _ in range(transport.BREAKER_THRESHOLD):
+        with pytest.raises(TransportError):
+            get_json("weather", "https://api.test/a")
+    calls = len(session.calls)
+
+    with pytest.raises(TransportError, match="circuit is open"):
+        get_json("weather", "https://api.test/a")
+    assert len(session.calls) == calls
+
+
+def test_breaker_ignores_rejected_requests(monkeypatch):
+    use_session(monkeypatch, FakeResponse(status=404))
+    for _ in range(transport.BREAKER_THRESHOLD + 1):
+        with pytest.raises(TransportError):
+            get_json("weather", "https://api.test/missing")
+    assert transport.breakers["weather"].allow()
+
+
+def test_concurrent_calls_share_one_request(monkeypatch):
+    def slow_answer():
+        time.sleep(0.1)
+        return FakeResponse(body=b'{"a": 1}')
+
+    session = use_session(monkeypatch, slow_answer)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(get_json("weather", "https://api.test/a"))
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"a": 1}] * 4
+    assert len(session.calls) == 1
+
+
+def test_coalesced_callers_get_the_leaders_error(monkeypatch):
+    def failing_fetch(*args):
+        time.sleep(0.1)
+        raise KeyError("broken")
+
+    monkeypatch.setattr(transport, "_fetch", failing_fetch)
+    errors = []
+
+    def call():
+        try:
+            get_json("weather", "https://api.test/a")
+        except Exception as e:
+            errors.append(type(e))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == [KeyError] * 3
+
+
+def test_cache_drops_least_recently_used(monkeypatch):
+    monkeypatch.setattr(transport, "MAX_CACHE_ENTRIES", 2)
+    use_session(monkeypatch, FakeResponse(body=b"{}"))
+    get_json("weather", "https://api.test/1")
+    get_json("weather", "https://api.test/2")
+    get_json("weather", "https://api.test/1")
+    get_json("weather", "https://api.test/3")
+
+    assert [url for url, _ in transport._cache] == [
+        "https://api.test/1",
+        "https://api.test/3",
+    ]